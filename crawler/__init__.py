@@ -36,7 +36,8 @@ from __future__ import annotations
 
 import asyncio
 import inspect
-from typing import Any, List, Optional, cast
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, List, Optional, cast
 
 from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig
 from crawl4ai.models import CrawlResult, CrawlResultContainer
@@ -91,6 +92,52 @@ def __getattr__(name):
     raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
+class _SharedCrawler:
+    """Browser shared by the pages of one ``crawl_pages_async`` batch.
+
+    The crawler is started on first use, so batches whose pages never reach
+    the browser (e.g. because ``crawl_page_async`` is replaced) don't launch
+    one. Once closed it refuses to start another browser, which would
+    otherwise never be closed.
+    """
+
+    __slots__ = ("storage_state", "_crawler", "_lock", "_closed")
+
+    def __init__(self, storage_state: Optional[str]) -> None:
+        self.storage_state = storage_state
+        self._crawler: Optional[AsyncWebCrawler] = None
+        self._lock = asyncio.Lock()
+        self._closed = False
+
+    async def get(self) -> AsyncWebCrawler:
+        async with self._lock:
+            if self._closed:
+                raise RuntimeError("Shared batch crawler is already closed")
+            if self._crawler is None:
+                if self.storage_state:
+                    crawler = AsyncWebCrawler(
+                        config=BrowserConfig(storage_state=self.storage_state)
+                    )
+                else:
+                    crawler = AsyncWebCrawler()
+                await crawler.start()
+                self._crawler = crawler
+        return self._crawler
+
+    async def close(self) -> None:
+        self._closed = True
+        if self._crawler is not None:
+            await self._crawler.close()
+            self._crawler = None
+
+
+# Set by crawl_pages_async for the duration of a batch; crawl_page_async
+# reuses its browser instead of launching one per page.
+_BATCH_CRAWLER: ContextVar[Optional[_SharedCrawler]] = ContextVar(
+    "_BATCH_CRAWLER", default=None
+)
+
+
 async def crawl_page_async(
     url: str,
     *,
@@ -113,13 +160,14 @@ async def crawl_page_async(
     """
     run_config = config or build_markdown_run_config()
     resolved_auth = resolve_auth(auth)
-    browser_cfg = (
-        BrowserConfig(storage_state=resolved_auth.storage_state)
-        if resolved_auth and resolved_auth.storage_state
-        else None
-    )
-
-    if browser_cfg is None:
+    storage_state = resolved_auth.storage_state if resolved_auth else None
+    shared = _BATCH_CRAWLER.get()
+    browser_cfg = BrowserConfig(storage_state=storage_state) if storage_state else None
+
+    if shared is not None and shared.storage_state == storage_state:
+        crawler = await shared.get()
+        container = await crawler.arun(url=url, config=run_config)
+    elif browser_cfg is None:
         async with AsyncWebCrawler() as crawler:
             container = await crawler.arun(url=url, config=run_config)
     else:
@@ -187,6 +235,7 @@ async def crawl_pages_async(
     concurrency: int = 3,
     dedup_mode: str = "exact",
     auth: Optional[AuthInput] = None,
+    on_document: Optional[Callable[[CrawledDocument], Awaitable[None]]] = None,
 ) -> List[CrawledDocument]:
     """
     Crawl multiple pages and return their extracted markdown.
@@ -195,6 +244,11 @@ async def crawl_pages_async(
         urls: List of URLs to crawl.
         config: Optional CrawlerRunConfig for advanced customization.
         concurrency: Maximum number of concurrent crawls.
+        on_document: Optional coroutine callback awaited with each document
+            (successful or failed) as soon as its crawl finishes, outside the
+            concurrency limit, e.g. to write output while other pages crawl.
+            If it raises, the remaining crawls are cancelled and the error
+            propagates from this call.
 
     Returns:
         List of CrawledDocument objects (in same order as input URLs).
@@ -207,7 +261,7 @@ async def crawl_pages_async(
     async def crawl_one(url: str) -> CrawledDocument:
         async with semaphore:
             try:
-                return await crawl_page_async(
+                doc = await crawl_page_async(
                     url,
                     config=run_config,
                     dedup_mode=dedup_mode,
@@ -215,16 +269,31 @@ async def crawl_pages_async(
                 )
             except Exception as exc:
                 # Return a failed document instead of raising
-                return CrawledDocument(
+                doc = CrawledDocument(
                     request_url=url,
                     final_url=url,
                     status="failed",
                     markdown="",
                     error_message=str(exc),
                 )
-
-    tasks = [crawl_one(url) for url in urls]
-    return await asyncio.gather(*tasks)
+        if on_document is not None:
+            await on_document(doc)
+        return doc
+
+    shared = _SharedCrawler(resolved_auth.storage_state if resolved_auth else None)
+    token = _BATCH_CRAWLER.set(shared)
+    # Tasks copy the current context, so every page sees the shared crawler.
+    tasks = [asyncio.ensure_future(crawl_one(url)) for url in urls]
+    try:
+        return await asyncio.gather(*tasks)
+    finally:
+        # gather() leaves siblings running when one task raises; stop them
+        # before the shared browser goes away underneath them.
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        _BATCH_CRAWLER.reset(token)
+        await shared.close()
 
 
 def crawl_pages(
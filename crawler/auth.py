@@ -2,11 +2,12 @@
 
 from __future__ import annotations
 
-import json
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Mapping, Optional, TypeAlias, Union
 
+from .serialization import loads_json
+
 
 class AuthConfigError(ValueError):
     """Raised when auth input cannot be resolved safely."""
@@ -45,7 +46,7 @@ def resolve_auth(auth: Optional[AuthInput]) -> Optional[ResolvedAuth]:
     if not raw_storage_state:
         raise AuthConfigError("Auth storage_state must be a non-empty path")
 
-    storage_state_path = _canonicalize_path(raw_storage_state)
+    storage_state_path = canonicalize_path(raw_storage_state)
 
     if not storage_state_path.exists():
         raise AuthConfigError(
@@ -58,8 +59,7 @@ def resolve_auth(auth: Optional[AuthInput]) -> Optional[ResolvedAuth]:
         )
 
     try:
-        with storage_state_path.open("r", encoding="utf-8") as state_file:
-            parsed = json.load(state_file)
+        parsed = loads_json(storage_state_path.read_bytes())
     except PermissionError as exc:
         raise AuthConfigError(
             f"Auth storage_state file is not readable: {storage_state_path}"
@@ -68,7 +68,7 @@ def resolve_auth(auth: Optional[AuthInput]) -> Optional[ResolvedAuth]:
         raise AuthConfigError(
             f"Auth storage_state file is not readable: {storage_state_path}"
         ) from exc
-    except json.JSONDecodeError as exc:
+    except ValueError as exc:
         raise AuthConfigError(
             f"Auth storage_state is invalid JSON: {storage_state_path}"
         ) from exc
@@ -100,7 +100,12 @@ def _coerce_auth_config(auth: AuthInput) -> AuthConfig:
     )
 
 
-def _canonicalize_path(path_value: str) -> Path:
+def canonicalize_path(path_value: str) -> Path:
+    """Resolve a user-supplied path (``~``, relative to cwd) to an absolute one.
+
+    Shared by auth resolution, session capture, and the MCP crawl cache so all
+    three agree on a file's identity.
+    """
     path = Path(path_value).expanduser()
     if not path.is_absolute():
         path = Path.cwd() / path
@@ -0,0 +1,57 @@
+"""Small in-process caches used by the MCP server."""
+
+from __future__ import annotations
+
+import time
+from typing import Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """Bounded mapping whose entries expire ``ttl`` seconds after insertion.
+
+    Entries are kept in insertion order, which (with a fixed TTL) is also
+    expiry order, so a full cache evicts its oldest entry. Not thread-safe;
+    intended for use from a single event loop.
+    """
+
+    __slots__ = ("maxsize", "ttl", "_timer", "_data")
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._timer = timer
+        self._data: Dict[K, Tuple[float, V]] = {}
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: K) -> Optional[V]:
+        """Return the cached value for ``key``, or None if missing or expired."""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= self._timer():
+            del self._data[key]
+            return None
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        """Store ``value`` under ``key``, evicting the oldest entry when full."""
+        data = self._data
+        data.pop(key, None)
+        if len(data) >= self.maxsize:
+            del data[next(iter(data))]
+        data[key] = (self._timer() + self.ttl, value)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._data.clear()
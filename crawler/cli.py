@@ -4,22 +4,35 @@ from __future__ import annotations
 
 import argparse
 import asyncio
-import json
+import functools
 import logging
 import os
-import re
 import shutil
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
 
-import httpx
-from dotenv import load_dotenv
+from .output import doc_to_dict, strip_markdown_links
+from .serialization import dumps_json_bytes, loads_json, write_json
+from .session_capture import (
+    CdpSessionEntry,
+    capture_session_async,
+    export_cdp_storage_state_async,
+    list_cdp_sessions_async,
+)
+
+if TYPE_CHECKING:
+    from .document import CrawledDocument
 
 # Configuration directory for global CLI usage
 CONFIG_DIR = Path.home() / ".config" / "searxncrawl"
 CONFIG_ENV_FILE = CONFIG_DIR / ".env"
 
+# Set once _load_config() has run; holds the .env file that was loaded, if any
+_config_loaded = False
+_loaded_env_file: Optional[Path] = None
+
 
 def _load_config() -> None:
     """Load .env configuration with fallback to user config directory.
@@ -30,17 +43,25 @@ def _load_config() -> None:
 
     If neither exists and .env.example is found in the package directory,
     it will be copied to ~/.config/searxncrawl/.env as a starting point.
+
+    Called by the entry points after argument parsing, so ``--help`` and
+    usage errors never touch the filesystem or import python-dotenv. The
+    lookup runs once per process; later calls return immediately.
     """
-    # First, try current directory
-    local_env = Path.cwd() / ".env"
-    if local_env.is_file():
-        load_dotenv(local_env)
-        return
+    global _config_loaded, _loaded_env_file
 
-    # Second, try user config directory
-    if CONFIG_ENV_FILE.is_file():
-        load_dotenv(CONFIG_ENV_FILE)
+    if _config_loaded:
         return
+    _config_loaded = True
+
+    from dotenv import load_dotenv
+
+    # First, try current directory, then the user config directory
+    for env_file in (Path.cwd() / ".env", CONFIG_ENV_FILE):
+        if env_file.is_file():
+            load_dotenv(env_file)
+            _loaded_env_file = env_file
+            return
 
     # No .env found - try to create config from .env.example
     package_dir = Path(__file__).parent.parent
@@ -56,21 +77,11 @@ def _load_config() -> None:
                 CONFIG_ENV_FILE,
             )
             load_dotenv(CONFIG_ENV_FILE)
+            _loaded_env_file = CONFIG_ENV_FILE
         except OSError:
             pass  # Silently continue without config
 
 
-_load_config()
-
-from .document import CrawledDocument
-from .session_capture import (
-    CdpSessionEntry,
-    capture_session_async,
-    export_cdp_storage_state_async,
-    list_cdp_sessions_async,
-)
-
-
 def _setup_logging(verbose: bool) -> None:
     level = logging.DEBUG if verbose else logging.INFO
     logging.basicConfig(
@@ -80,17 +91,6 @@ def _setup_logging(verbose: bool) -> None:
     )
 
 
-def _strip_markdown_links(text: str) -> str:
-    """Remove markdown links from text, keeping only the link text."""
-    # Replace [text](url) with just text
-    text = re.sub(r"\[([^\]]+)\]\([^)]+\)", r"\1", text)
-    # Remove standalone URLs (http/https)
-    text = re.sub(r"https?://\S+", "", text)
-    # Clean up any double spaces left behind
-    text = re.sub(r"  +", " ", text)
-    return text
-
-
 def _format_search_markdown(data: Dict[str, Any]) -> str:
     """Format search results as markdown.
 
@@ -135,32 +135,68 @@ def _format_search_markdown(data: Dict[str, Any]) -> str:
     return "\n".join(lines)
 
 
-def _doc_to_dict(doc: CrawledDocument) -> dict:
-    """Convert document to JSON-serializable dict."""
-    return {
-        "request_url": doc.request_url,
-        "final_url": doc.final_url,
-        "status": doc.status,
-        "markdown": doc.markdown,
-        "error_message": doc.error_message,
-        "metadata": doc.metadata,
-        "references": [
-            {"index": ref.index, "href": ref.href, "label": ref.label}
-            for ref in doc.references
-        ],
-    }
+_HOST_FILENAME_TABLE = str.maketrans({":": "_", ".": "_"})
+_PATH_FILENAME_TABLE = str.maketrans({"/": "_"})
 
 
+@functools.lru_cache(maxsize=4096)
 def _url_to_filename(url: str) -> str:
-    """Convert URL to a safe filename."""
-    from urllib.parse import urlparse
+    """Convert URL to a safe filename.
 
-    parsed = urlparse(url)
-    path = parsed.path.strip("/").replace("/", "_") or "index"
-    host = parsed.netloc.replace(":", "_").replace(".", "_")
+    Splits the URL by hand instead of going through ``urlparse``; host and
+    path are taken the same way (query, fragment and ``;params`` dropped).
+    """
+    _, sep, rest = url.partition("://")
+    if not sep:
+        sep, rest = ("//", url[2:]) if url.startswith("//") else ("", url)
+    for delimiter in "?#":
+        rest = rest.partition(delimiter)[0]
+    if sep:
+        host, slash, path = rest.partition("/")
+        path = slash + path
+    else:
+        host, path = "", rest
+    params_at = path.find(";", max(path.rfind("/"), 0))
+    if params_at != -1:
+        path = path[:params_at]
+    path = path.strip("/").translate(_PATH_FILENAME_TABLE) or "index"
+    host = host.translate(_HOST_FILENAME_TABLE)
     return f"{host}_{path}"[:100]
 
 
+def _print_bytes(data: bytes) -> None:
+    """Print UTF-8 encoded ``data`` followed by a newline to stdout.
+
+    Writes to the binary buffer underneath ``sys.stdout`` so large outputs skip
+    the text layer; falls back to ``print`` when stdout has no buffer.
+    """
+    buffer = getattr(sys.stdout, "buffer", None)
+    if buffer is None:
+        print(data.decode("utf-8"))
+        return
+    sys.stdout.flush()
+    buffer.write(data)
+    buffer.write(b"\n")
+    buffer.flush()
+
+
+def _write_file_bytes(path: Union[str, Path], data: bytes) -> None:
+    """Write ``data`` to ``path`` with raw fd writes, bypassing the io stack."""
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+    fd = os.open(path, flags, 0o666)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view) :]
+    finally:
+        os.close(fd)
+
+
+def _markdown_path(prefix: str, doc: CrawledDocument) -> str:
+    """Return the ``<prefix><url-derived name>.md`` output path for ``doc``."""
+    return prefix + _url_to_filename(doc.final_url) + ".md"
+
+
 def _write_output(
     docs: List[CrawledDocument],
     output: Optional[str],
@@ -168,21 +204,18 @@ def _write_output(
     remove_links: bool = False,
 ) -> None:
     """Write documents to output destination."""
-    # Apply link removal if requested
-    if remove_links and not json_output:
+    # Apply link removal once up front so every output branch sees it
+    if remove_links:
         for doc in docs:
-            doc.markdown = _strip_markdown_links(doc.markdown)
+            doc.markdown = strip_markdown_links(doc.markdown)
 
     if len(docs) == 1 and output is None:
         # Single doc, no output specified -> stdout
         doc = docs[0]
         if json_output:
-            doc_dict = _doc_to_dict(doc)
-            if remove_links and doc_dict.get("markdown"):
-                doc_dict["markdown"] = _strip_markdown_links(doc_dict["markdown"])
-            print(json.dumps(doc_dict, indent=2, ensure_ascii=False))
+            _print_bytes(dumps_json_bytes(doc_to_dict(doc)))
         else:
-            print(doc.markdown)
+            _print_bytes(doc.markdown.encode("utf-8"))
         return
 
     if len(docs) == 1 and output and not output.endswith("/"):
@@ -191,12 +224,9 @@ def _write_output(
         path = Path(output)
         path.parent.mkdir(parents=True, exist_ok=True)
         if json_output:
-            doc_dict = _doc_to_dict(doc)
-            if remove_links and doc_dict.get("markdown"):
-                doc_dict["markdown"] = _strip_markdown_links(doc_dict["markdown"])
-            path.write_text(json.dumps(doc_dict, indent=2, ensure_ascii=False))
+            write_json(path, doc_to_dict(doc))
         else:
-            path.write_text(doc.markdown)
+            _write_file_bytes(path, doc.markdown.encode("utf-8"))
         logging.info("Wrote %s", path)
         return
 
@@ -206,22 +236,29 @@ def _write_output(
 
     if json_output:
         # Write all docs as single JSON array
-        all_docs = []
-        for doc in docs:
-            doc_dict = _doc_to_dict(doc)
-            if remove_links and doc_dict.get("markdown"):
-                doc_dict["markdown"] = _strip_markdown_links(doc_dict["markdown"])
-            all_docs.append(doc_dict)
+        all_docs = [doc_to_dict(doc) for doc in docs]
         out_path = out_dir / "crawl_results.json"
-        out_path.write_text(json.dumps(all_docs, indent=2, ensure_ascii=False))
+        write_json(out_path, all_docs)
         logging.info("Wrote %d documents to %s", len(docs), out_path)
     else:
-        # Write each doc as separate .md file
-        for doc in docs:
-            filename = _url_to_filename(doc.final_url) + ".md"
-            path = out_dir / filename
-            path.write_text(doc.markdown)
-            logging.info("Wrote %s", path)
+        # Write each doc as separate .md file; the writes are independent,
+        # so overlap their open/write latency on a small thread pool. Paths
+        # are built as plain strings to keep Path objects out of the loop.
+        # When several docs map to one file the last one wins, as with
+        # sequential writes, and no two workers ever share a path.
+        prefix = os.path.join(str(out_dir), "")
+        by_path = {_markdown_path(prefix, doc): doc for doc in docs}
+
+        def _write_one(item: tuple[str, CrawledDocument]) -> None:
+            path, doc = item
+            _write_file_bytes(path, doc.markdown.encode("utf-8"))
+
+        if not by_path:
+            return
+        with ThreadPoolExecutor(max_workers=min(32, len(by_path))) as executor:
+            # Consume the results so write errors propagate
+            list(executor.map(_write_one, by_path.items()))
+        logging.info("Wrote %d markdown files to %s", len(by_path), out_dir)
 
 
 # =============================================================================
@@ -229,7 +266,8 @@ def _write_output(
 # =============================================================================
 
 
-def _parse_crawl_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+@functools.lru_cache(maxsize=1)
+def _build_crawl_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         prog="crawl",
         description="Crawl web pages and extract markdown content.",
@@ -330,14 +368,108 @@ Examples:
         help="Enable verbose logging",
     )
 
-    return parser.parse_args(argv)
+    return parser
+
+
+# Tables for _fast_parse_crawl_args; kept in sync with _build_crawl_parser
+# (tests compare them against the parser's actions).
+_CRAWL_FLAGS: Dict[str, str] = {
+    "--site": "site",
+    "--include-subdomains": "include_subdomains",
+    "--json": "json_output",
+    "--remove-links": "remove_links",
+    "-v": "verbose",
+    "--verbose": "verbose",
+}
+_CRAWL_OPTIONS: Dict[str, tuple[str, type]] = {
+    "-o": ("output", str),
+    "--output": ("output", str),
+    "--max-depth": ("max_depth", int),
+    "--max-pages": ("max_pages", int),
+    "--concurrency": ("concurrency", int),
+    "--storage-state": ("storage_state", str),
+    "--dedup-mode": ("dedup_mode", str),
+}
+_CRAWL_CHOICES: Dict[str, tuple[str, ...]] = {"dedup_mode": ("exact", "off")}
+_CRAWL_DEFAULTS: Dict[str, Any] = {
+    "output": None,
+    "site": False,
+    "max_depth": 2,
+    "max_pages": 25,
+    "include_subdomains": False,
+    "concurrency": 3,
+    "storage_state": None,
+    "dedup_mode": "exact",
+    "json_output": False,
+    "remove_links": False,
+    "verbose": False,
+}
+
+
+def _fast_parse_crawl_args(argv: List[str]) -> Optional[argparse.Namespace]:
+    """Parse the common crawl invocations without building the argparse parser.
+
+    Handles positional URLs plus the exact option spellings in the tables
+    above. Returns None for anything else (help, ``--opt=value``, prefixes,
+    bad values, no URLs) so the caller can defer to argparse, which then
+    produces the usual help text or error.
+    """
+    values = dict(_CRAWL_DEFAULTS)
+    urls: List[str] = []
+    urls_closed = False
+    i = 0
+    while i < len(argv):
+        token = argv[i]
+        i += 1
+        if not token.startswith("-") or token == "-":
+            if urls_closed:
+                # argparse only accepts the URLs as one contiguous run
+                return None
+            urls.append(token)
+            continue
+        urls_closed = bool(urls)
+        if token in _CRAWL_FLAGS:
+            values[_CRAWL_FLAGS[token]] = True
+        elif token in _CRAWL_OPTIONS:
+            if i >= len(argv) or argv[i].startswith("-"):
+                return None
+            dest, convert = _CRAWL_OPTIONS[token]
+            try:
+                value = convert(argv[i])
+            except ValueError:
+                return None
+            if dest in _CRAWL_CHOICES and value not in _CRAWL_CHOICES[dest]:
+                return None
+            values[dest] = value
+            i += 1
+        else:
+            return None
+    if not urls:
+        return None
+    return argparse.Namespace(urls=urls, **values)
+
+
+def _parse_crawl_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    if argv is None:
+        argv = sys.argv[1:]
+    args = _fast_parse_crawl_args(argv)
+    if args is not None:
+        return args
+    return _build_crawl_parser().parse_args(argv)
 
 
 async def _run_crawl_async(args: argparse.Namespace) -> int:
     """Main async entry point for crawl."""
     from . import crawl_page_async, crawl_pages_async, crawl_site_async
 
+    urls = args.urls
+    dedup_mode = args.dedup_mode
+    json_output = args.json_output
+    output = args.output
+    remove_links = args.remove_links
+
     docs: List[CrawledDocument] = []
+    streamed = False
     auth = (
         {"storage_state": args.storage_state}
         if getattr(args, "storage_state", None)
@@ -345,22 +477,22 @@ async def _run_crawl_async(args: argparse.Namespace) -> int:
     )
 
     if args.site:
-        if len(args.urls) > 1:
+        if len(urls) > 1:
             logging.error("Site crawl only supports a single seed URL")
             return 1
 
         logging.info(
             "Starting site crawl: %s (max_depth=%d, max_pages=%d)",
-            args.urls[0],
+            urls[0],
             args.max_depth,
             args.max_pages,
         )
         result = await crawl_site_async(
-            args.urls[0],
+            urls[0],
             max_depth=args.max_depth,
             max_pages=args.max_pages,
             include_subdomains=args.include_subdomains,
-            dedup_mode=args.dedup_mode,
+            dedup_mode=dedup_mode,
             auth=auth,
         )
         docs = result.documents
@@ -371,21 +503,57 @@ async def _run_crawl_async(args: argparse.Namespace) -> int:
             result.stats.get("failed_pages", 0),
         )
 
-    elif len(args.urls) == 1:
-        logging.info("Crawling: %s", args.urls[0])
+    elif len(urls) == 1:
+        logging.info("Crawling: %s", urls[0])
         doc = await crawl_page_async(
-            args.urls[0],
-            dedup_mode=args.dedup_mode,
+            urls[0],
+            dedup_mode=dedup_mode,
             auth=auth,
         )
         docs = [doc]
 
+    elif not json_output and output and output.endswith("/"):
+        # Markdown into an explicit directory: each page gets its own file,
+        # so write pages as they finish instead of after the whole batch.
+        logging.info("Crawling %d URLs...", len(urls))
+        out_dir = Path(output)
+        prefix = os.path.join(str(out_dir), "")
+        # One lock per output path so pages that map to the same file are
+        # written one after another rather than interleaved.
+        path_locks: Dict[str, asyncio.Lock] = {}
+
+        def _write_streamed(path: str, doc: CrawledDocument) -> None:
+            out_dir.mkdir(parents=True, exist_ok=True)
+            if remove_links:
+                doc.markdown = strip_markdown_links(doc.markdown)
+            _write_file_bytes(path, doc.markdown.encode("utf-8"))
+
+        async def _on_document(doc: CrawledDocument) -> None:
+            if doc.status != "success":
+                return
+            path = _markdown_path(prefix, doc)
+            async with path_locks.setdefault(path, asyncio.Lock()):
+                await asyncio.to_thread(_write_streamed, path, doc)
+
+        docs = await crawl_pages_async(
+            urls,
+            concurrency=args.concurrency,
+            dedup_mode=dedup_mode,
+            auth=auth,
+            on_document=_on_document,
+        )
+        streamed = True
+        if path_locks:
+            logging.info(
+                "Wrote %d markdown files to %s", len(path_locks), out_dir
+            )
+
     else:
-        logging.info("Crawling %d URLs...", len(args.urls))
+        logging.info("Crawling %d URLs...", len(urls))
         docs = await crawl_pages_async(
-            args.urls,
+            urls,
             concurrency=args.concurrency,
-            dedup_mode=args.dedup_mode,
+            dedup_mode=dedup_mode,
             auth=auth,
         )
 
@@ -397,16 +565,17 @@ async def _run_crawl_async(args: argparse.Namespace) -> int:
         for doc in failed:
             logging.warning("Failed: %s - %s", doc.request_url, doc.error_message)
 
-    if not successful and not args.json_output:
+    if not successful and not json_output:
         logging.error("All crawls failed")
         return 1
 
-    _write_output(
-        docs if args.json_output else successful,
-        args.output,
-        args.json_output,
-        remove_links=args.remove_links,
-    )
+    if not streamed:
+        _write_output(
+            docs if json_output else successful,
+            output,
+            json_output,
+            remove_links=remove_links,
+        )
 
     return 0 if successful else 1
 
@@ -415,6 +584,7 @@ def main(argv: Optional[List[str]] = None) -> int:
     """CLI entry point for crawl command."""
     args = _parse_crawl_args(argv)
     _setup_logging(args.verbose)
+    _load_config()
 
     try:
         return asyncio.run(_run_crawl_async(args))
@@ -433,7 +603,8 @@ def main(argv: Optional[List[str]] = None) -> int:
 # =============================================================================
 
 
-def _parse_capture_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+@functools.lru_cache(maxsize=1)
+def _build_capture_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         prog="crawl-capture",
         description=(
@@ -520,7 +691,11 @@ Examples:
         help="Enable verbose logging",
     )
 
-    return parser.parse_args(argv)
+    return parser
+
+
+def _parse_capture_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    return _build_capture_parser().parse_args(argv)
 
 
 def _format_cdp_session(entry: CdpSessionEntry, session_index: int) -> str:
@@ -675,6 +850,7 @@ def capture_main(argv: Optional[List[str]] = None) -> int:
     """CLI entry point for isolated session capture."""
     args = _parse_capture_args(argv)
     _setup_logging(args.verbose)
+    _load_config()
 
     try:
         return asyncio.run(_run_capture_async(args))
@@ -693,7 +869,8 @@ def capture_main(argv: Optional[List[str]] = None) -> int:
 # =============================================================================
 
 
-def _parse_search_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+@functools.lru_cache(maxsize=1)
+def _build_search_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         prog="search",
         description="Search the web using SearXNG metasearch engine.",
@@ -781,20 +958,27 @@ Examples:
         help="Enable verbose logging",
     )
 
-    return parser.parse_args(argv)
+    return parser
+
+
+def _parse_search_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    return _build_search_parser().parse_args(argv)
 
 
 async def _run_search_async(args: argparse.Namespace) -> int:
     """Main async entry point for search."""
+    import httpx
+
     searxng_url = os.getenv("SEARXNG_URL", "http://localhost:8888")
     searxng_username = os.getenv("SEARXNG_USERNAME")
     searxng_password = os.getenv("SEARXNG_PASSWORD")
 
-    logging.info("Searching for: %s", args.query)
+    query = args.query
+    logging.info("Searching for: %s", query)
 
     # Build search parameters
     params: Dict[str, Any] = {
-        "q": args.query,
+        "q": query,
         "format": "json",
         "language": args.language,
         "safesearch": args.safesearch,
@@ -826,7 +1010,7 @@ async def _run_search_async(args: argparse.Namespace) -> int:
         ) as client:
             response = await client.get("/search", params=params)
             response.raise_for_status()
-            data = response.json()
+            data = loads_json(response.content)
 
         # Limit results
         max_results = min(max(1, args.max_results), 50)
@@ -838,17 +1022,17 @@ async def _run_search_async(args: argparse.Namespace) -> int:
 
         # Format output
         if args.json_output:
-            output = json.dumps(data, indent=2, ensure_ascii=False)
+            output = dumps_json_bytes(data)
         else:
-            output = _format_search_markdown(data)
+            output = _format_search_markdown(data).encode("utf-8")
 
         if args.output:
             path = Path(args.output)
             path.parent.mkdir(parents=True, exist_ok=True)
-            path.write_text(output)
+            path.write_bytes(output)
             logging.info("Wrote results to %s", path)
         else:
-            print(output)
+            _print_bytes(output)
 
         return 0
 
@@ -880,6 +1064,7 @@ def search_main(argv: Optional[List[str]] = None) -> int:
     """CLI entry point for search command."""
     args = _parse_search_args(argv)
     _setup_logging(args.verbose)
+    _load_config()
 
     try:
         return asyncio.run(_run_search_async(args))
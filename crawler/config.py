@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
+import functools
 import logging
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from crawl4ai import CrawlerRunConfig
 from crawl4ai.async_configs import CacheMode
@@ -14,7 +15,7 @@ from crawl4ai.markdown_generation_strategy import DefaultMarkdownGenerator
 LOGGER = logging.getLogger(__name__)
 
 # Selectors for main content areas (documentation sites, articles, etc.)
-MAIN_SELECTORS: List[str] = [
+MAIN_SELECTORS: Tuple[str, ...] = (
     "main",
     "[role='main']",
     "article",
@@ -28,10 +29,10 @@ MAIN_SELECTORS: List[str] = [
     "#content-area",
     "[data-docs-content]",
     "[data-content]",
-]
+)
 
 # Selectors for elements to exclude (navigation, footers, sidebars, cookie banners)
-EXCLUDED_SELECTORS: List[str] = [
+EXCLUDED_SELECTORS: Tuple[str, ...] = (
     "nav",
     "footer",
     "header",
@@ -52,10 +53,15 @@ EXCLUDED_SELECTORS: List[str] = [
     ".cky-modal",
     ".cky-consent-bar",
     ".cky-notice",
-]
+)
 
+# Comma-joined forms of the selector tuples above, built once at import so
+# per-URL config builders don't redo the joins.
+_MAIN_SELECTOR_STR = ", ".join(MAIN_SELECTORS)
+_EXCLUDED_SELECTOR_STR = ", ".join(EXCLUDED_SELECTORS)
 
-@dataclass
+
+@dataclass(slots=True)
 class RunConfigOverrides:
     """Optional crawl-run overrides."""
 
@@ -79,9 +85,9 @@ class RunConfigOverrides:
     exclude_external_links: Optional[bool] = None
 
 
-def _convert_cache_mode(value: Optional[str], default: CacheMode) -> CacheMode:
-    if not value:
-        return default
+@functools.lru_cache(maxsize=32)
+def _lookup_cache_mode(value: str) -> Optional[CacheMode]:
+    """Resolve a cache mode by member name or value; None if unknown."""
     candidate = value.strip().replace("CacheMode.", "")
     try:
         return CacheMode[candidate.upper()]
@@ -90,50 +96,56 @@ def _convert_cache_mode(value: Optional[str], default: CacheMode) -> CacheMode:
     try:
         return CacheMode(candidate.lower())
     except ValueError:
+        return None
+
+
+def _convert_cache_mode(value: Optional[str], default: CacheMode) -> CacheMode:
+    if not value:
+        return default
+    mode = _lookup_cache_mode(value)
+    if mode is None:
         LOGGER.warning(
             "Unknown cache_mode '%s'; falling back to %s.", value, default.name
         )
         return default
+    return mode
+
+
+# Override fields copied verbatim onto CrawlerRunConfig, in application order.
+# The flag selects truthiness (True) or "is not None" (False) as the test for
+# whether an override is set. cache_mode, target_elements and excluded_tags
+# need conversion/copying and are handled separately in _apply_overrides.
+_OVERRIDE_FIELDS: tuple[tuple[str, bool], ...] = (
+    ("verbose", False),
+    ("semaphore_count", False),
+    ("wait_until", False),
+    ("delay_before_return_html", False),
+    ("mean_delay", False),
+    ("max_range", False),
+    ("magic", False),
+    ("css_selector", True),
+    ("excluded_selector", True),
+    ("scan_full_page", False),
+    ("js_code", True),
+    ("wait_for", True),
+    ("ignore_body_visibility", False),
+    ("stream", False),
+    ("exclude_external_links", False),
+)
 
 
 def _apply_overrides(config: CrawlerRunConfig, overrides: RunConfigOverrides) -> None:
     """Apply optional overrides to a CrawlerRunConfig."""
-    if overrides.verbose is not None:
-        config.verbose = overrides.verbose
-    if overrides.semaphore_count is not None:
-        config.semaphore_count = overrides.semaphore_count
-    if overrides.wait_until is not None:
-        config.wait_until = overrides.wait_until
-    if overrides.delay_before_return_html is not None:
-        config.delay_before_return_html = overrides.delay_before_return_html
-    if overrides.mean_delay is not None:
-        config.mean_delay = overrides.mean_delay
-    if overrides.max_range is not None:
-        config.max_range = overrides.max_range
-    if overrides.magic is not None:
-        config.magic = overrides.magic
+    for name, truthy in _OVERRIDE_FIELDS:
+        value = getattr(overrides, name)
+        if value if truthy else value is not None:
+            setattr(config, name, value)
     if overrides.cache_mode:
         config.cache_mode = _convert_cache_mode(overrides.cache_mode, config.cache_mode)
-    if overrides.css_selector:
-        config.css_selector = overrides.css_selector
     if overrides.target_elements:
         config.target_elements = list(overrides.target_elements)
     if overrides.excluded_tags:
         config.excluded_tags = list(overrides.excluded_tags)
-    if overrides.excluded_selector:
-        config.excluded_selector = overrides.excluded_selector
-    if overrides.scan_full_page is not None:
-        config.scan_full_page = overrides.scan_full_page
-    if overrides.js_code:
-        config.js_code = overrides.js_code
-    if overrides.wait_for:
-        config.wait_for = overrides.wait_for
-    if overrides.ignore_body_visibility is not None:
-        config.ignore_body_visibility = overrides.ignore_body_visibility
-    if overrides.stream is not None:
-        config.stream = overrides.stream
-    if overrides.exclude_external_links is not None:
-        config.exclude_external_links = overrides.exclude_external_links
 
 
 def build_markdown_generator() -> DefaultMarkdownGenerator:
@@ -165,9 +177,9 @@ def build_markdown_run_config(
         delay_before_return_html=0.5,
         mean_delay=0.5,
         max_range=0.3,
-        target_elements=list(MAIN_SELECTORS),
+        target_elements=MAIN_SELECTORS,
         excluded_tags=["nav", "footer", "header", "aside", "form", "sidebar"],
-        excluded_selector=", ".join(EXCLUDED_SELECTORS),
+        excluded_selector=_EXCLUDED_SELECTOR_STR,
         markdown_generator=generator,
         cache_mode=CacheMode.BYPASS,
         scan_full_page=True,
@@ -197,10 +209,10 @@ def build_discovery_run_config(
         magic=True,
         cache_mode=CacheMode.BYPASS,
         markdown_generator=generator,
-        css_selector=", ".join(MAIN_SELECTORS),
-        target_elements=list(MAIN_SELECTORS),
+        css_selector=_MAIN_SELECTOR_STR,
+        target_elements=MAIN_SELECTORS,
         excluded_tags=["nav", "footer", "header", "aside", "form"],
-        excluded_selector=", ".join(EXCLUDED_SELECTORS),
+        excluded_selector=_EXCLUDED_SELECTOR_STR,
         ignore_body_visibility=False,
     )
     if overrides:
@@ -6,8 +6,16 @@ import hashlib
 import re
 from typing import Dict, List, Literal, Tuple
 
+try:
+    import xxhash
+except ImportError:  # pragma: no cover - optional dependency
+    xxhash = None  # type: ignore[assignment]
+
 DedupMode = Literal["exact", "off"]
 
+_SECTION_SPLIT_RE = re.compile(r"\n\s*\n+")
+_HEADING_SPLIT_RE = re.compile(r"(?m)(?=^\s{0,3}#{1,6}\s+\S)")
+
 
 def dedup_markdown(
     markdown: str, mode: DedupMode = "exact"
@@ -44,19 +52,15 @@ def dedup_markdown_exact(markdown: str) -> Tuple[str, Dict[str, int | str | bool
         }
         return "", empty_stats
 
-    seen: set[str] = set()
-    kept: List[str] = []
-    removed_count = 0
-
+    # Insertion-ordered map of fingerprint -> first section with it; the
+    # values reference the existing section strings, so nothing is copied
+    # until the final join.
+    kept: Dict[bytes, str] = {}
     for section in sections:
-        fingerprint = _fingerprint_section(section)
-        if fingerprint in seen:
-            removed_count += 1
-            continue
-        seen.add(fingerprint)
-        kept.append(section)
+        kept.setdefault(_fingerprint_section(section), section)
+    removed_count = len(sections) - len(kept)
 
-    deduped = "\n\n".join(kept)
+    deduped = "\n\n".join(kept.values())
     chars_removed = max(0, len(source.strip()) - len(deduped))
     stats: Dict[str, int | str | bool] = {
         "dedup_mode": "exact",
@@ -72,7 +76,7 @@ def _split_sections(markdown: str) -> List[str]:
     text = _normalize_line_endings(markdown).strip()
     if not text:
         return []
-    chunks = re.split(r"\n\s*\n+", text)
+    chunks = _SECTION_SPLIT_RE.split(text)
 
     sections: List[str] = []
     for chunk in chunks:
@@ -81,7 +85,7 @@ def _split_sections(markdown: str) -> List[str]:
             continue
         # Further split chunks that contain heading boundaries to avoid
         # preface-text + repeated heading block being treated as one section.
-        subchunks = re.split(r"(?m)(?=^\s{0,3}#{1,6}\s+\S)", chunk)
+        subchunks = _HEADING_SPLIT_RE.split(chunk)
         normalized_subchunks = [
             _normalize_section(sub) for sub in subchunks if sub and sub.strip()
         ]
@@ -103,6 +107,11 @@ def _normalize_section(section: str) -> str:
     return normalized
 
 
-def _fingerprint_section(section: str) -> str:
-    normalized = _normalize_section(section)
-    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+def _fingerprint_section(section: str) -> bytes:
+    # Expects a section from _split_sections, which are already normalized.
+    # Non-cryptographic use: a 128-bit xxh3 digest is ample for duplicate
+    # detection within one document; SHA-256 is the fallback without xxhash.
+    data = section.encode("utf-8")
+    if xxhash is not None:
+        return xxhash.xxh3_128_digest(data)
+    return hashlib.sha256(data).digest()
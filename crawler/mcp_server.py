@@ -25,19 +25,37 @@ Environment Variables:
 from __future__ import annotations
 
 import argparse
+import asyncio
+import contextlib
+import functools
 import json
 import logging
 import os
 import sys
-from datetime import datetime, timezone
+import time
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
 
-import httpx
 from dotenv import load_dotenv
-from fastmcp import FastMCP
 
+from .auth import canonicalize_path
+from .cache import TTLCache
 from .document import CrawledDocument
+from .output import doc_to_dict, strip_markdown_links
+from .serialization import dumps_json, loads_json
+
+if TYPE_CHECKING:
+    import httpx
+    from fastmcp import FastMCP
 
 # Configure logging
 logging.basicConfig(
@@ -55,10 +73,39 @@ SEARXNG_URL = os.getenv("SEARXNG_URL", "http://localhost:8888")
 SEARXNG_USERNAME = os.getenv("SEARXNG_USERNAME")
 SEARXNG_PASSWORD = os.getenv("SEARXNG_PASSWORD")
 
-# Create the MCP server
-mcp = FastMCP(
-    name="Web Crawler & Search",
-    instructions="""
+# Identity of a storage_state file: canonical path, mtime and size, so a
+# re-captured session (same path, new contents) never hits an old entry.
+_StorageStateKey = Tuple[str, int, int]
+
+# Successful single-page crawl results keyed by (url, dedup_mode,
+# storage_state identity), so repeated crawl tool calls skip the browser.
+_CRAWL_CACHE: TTLCache[
+    Tuple[str, str, Optional[_StorageStateKey]], CrawledDocument
+] = TTLCache(maxsize=2048, ttl=300)
+
+# time_range values SearXNG understands; anything else is dropped.
+_VALID_TIME_RANGES = frozenset(("day", "week", "month", "year"))
+
+# Parsed SearXNG responses keyed by (SearXNG URL, credentials, request
+# params) -- the same connection identity _SEARXNG_CLIENTS uses -- so
+# identical searches in quick succession skip the round trip.
+_SEARCH_CACHE: TTLCache[Tuple[Any, ...], Dict[str, Any]] = TTLCache(
+    maxsize=512, ttl=30
+)
+
+# Search responses with more results than this are serialized in a worker
+# thread.
+_THREADED_DUMP_MIN_RESULTS = 20
+
+# SearXNG requests currently in flight, keyed like _SEARCH_CACHE, so
+# concurrent identical searches share one upstream request.
+_SEARCH_INFLIGHT: Dict[Tuple[Any, ...], asyncio.Future] = {}
+
+# Shared SearXNG clients keyed by (event loop, URL, username, password); see
+# _get_searxng_client.
+_SEARXNG_CLIENTS: Dict[Tuple[Any, ...], httpx.AsyncClient] = {}
+
+MCP_INSTRUCTIONS = """
     A web crawler and search server that provides:
 
     1. Web Crawling Tools:
@@ -71,8 +118,42 @@ mcp = FastMCP(
     Output formats for crawl tools:
     - markdown: Clean concatenated markdown (default)
     - json: Full details including metadata and references
-    """,
-)
+    """
+
+
+@contextlib.asynccontextmanager
+async def _lifespan(server: FastMCP) -> AsyncIterator[Dict[str, Any]]:
+    """Close the shared SearXNG client when the server shuts down."""
+    try:
+        yield {}
+    finally:
+        await _close_searxng_client()
+
+
+@functools.lru_cache(maxsize=None)
+def _get_mcp() -> FastMCP:
+    """Create the MCP server and register its tools on first use.
+
+    fastmcp is only imported here, so importing this module (or running
+    ``crawl-mcp --help``) does not pay for it.
+    """
+    from fastmcp import FastMCP
+
+    server = FastMCP(
+        name="Web Crawler & Search",
+        instructions=MCP_INSTRUCTIONS,
+        lifespan=_lifespan,
+    )
+    for tool in (crawl, crawl_site, search):
+        server.tool(tool)
+    return server
+
+
+def __getattr__(name: str) -> Any:
+    # Keep ``crawler.mcp_server:mcp`` working for ``fastmcp run`` and imports
+    if name == "mcp":
+        return _get_mcp()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class OutputFormat(str, Enum):
@@ -82,69 +163,56 @@ class OutputFormat(str, Enum):
     json = "json"
 
 
-def _format_timestamp() -> str:
-    """Get current timestamp in ISO format."""
-    return datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
-
+# Lookup table for the tools' output_format argument; unknown values fall
+# back to markdown without raising and catching ValueError.
+_OUTPUT_FORMATS: Dict[str, OutputFormat] = {fmt.value: fmt for fmt in OutputFormat}
 
-def _strip_markdown_links(text: str) -> str:
-    """Remove markdown links from text, keeping only the link text.
 
-    Converts [text](url) to text and removes standalone URLs.
-    """
-    import re
-
-    # Replace [text](url) with just text
-    text = re.sub(r"\[([^\]]+)\]\([^)]+\)", r"\1", text)
-    # Remove standalone URLs (http/https)
-    text = re.sub(r"https?://\S+", "", text)
-    # Clean up any double spaces left behind
-    text = re.sub(r"  +", " ", text)
-    return text
-
-
-def _doc_to_dict(doc: CrawledDocument) -> dict:
-    """Convert CrawledDocument to JSON-serializable dict."""
-    return {
-        "request_url": doc.request_url,
-        "final_url": doc.final_url,
-        "status": doc.status,
-        "markdown": doc.markdown,
-        "error_message": doc.error_message,
-        "metadata": doc.metadata,
-        "references": [
-            {"index": ref.index, "href": ref.href, "label": ref.label}
-            for ref in doc.references
-        ],
-    }
+def _format_timestamp() -> str:
+    """Get current timestamp in ISO format."""
+    return time.strftime("%Y-%m-%d %H:%M:%S UTC", time.gmtime())
 
 
-def _format_single_doc_markdown(doc: CrawledDocument) -> str:
-    """Format a single document as markdown with header."""
-    lines = [
-        f"# {doc.final_url}",
-        f"_Crawled: {_format_timestamp()}_",
-        "",
-    ]
+def _iter_single_doc_lines(doc: CrawledDocument, timestamp: str) -> Iterator[str]:
+    """Yield the header lines and body of one markdown document section."""
+    yield f"# {doc.final_url}"
+    yield f"_Crawled: {timestamp}_"
+    yield ""
 
     if doc.status == "failed":
-        lines.append(f"**Error:** {doc.error_message}")
+        yield f"**Error:** {doc.error_message}"
     else:
-        lines.append(doc.markdown)
+        yield doc.markdown
 
-    return "\n".join(lines)
+
+def _format_single_doc_markdown(
+    doc: CrawledDocument, timestamp: Optional[str] = None
+) -> str:
+    """Format a single document as markdown with header.
+
+    ``timestamp`` lets callers formatting several documents share one
+    precomputed value instead of calling ``_format_timestamp`` per document.
+    """
+    if timestamp is None:
+        timestamp = _format_timestamp()
+    return "\n".join(_iter_single_doc_lines(doc, timestamp))
 
 
 def _format_multiple_docs_markdown(docs: List[CrawledDocument]) -> str:
-    """Format multiple documents as concatenated markdown."""
-    sections = []
+    """Format multiple documents as concatenated markdown.
+
+    All sections are joined in a single pass, without building an
+    intermediate string per document.
+    """
+    timestamp = _format_timestamp()
 
-    for i, doc in enumerate(docs):
-        if i > 0:
-            sections.append("\n---\n")
-        sections.append(_format_single_doc_markdown(doc))
+    def _iter_lines() -> Iterator[str]:
+        for i, doc in enumerate(docs):
+            if i > 0:
+                yield "\n---\n"
+            yield from _iter_single_doc_lines(doc, timestamp)
 
-    return "\n".join(sections)
+    return "\n".join(_iter_lines())
 
 
 def _format_output(
@@ -155,11 +223,11 @@ def _format_output(
 ) -> str:
     """Format crawl results based on output format."""
     if output_format == OutputFormat.json:
-        doc_dicts = [_doc_to_dict(doc) for doc in docs]
+        doc_dicts = [doc_to_dict(doc) for doc in docs]
         if remove_links:
             for d in doc_dicts:
                 if d.get("markdown"):
-                    d["markdown"] = _strip_markdown_links(d["markdown"])
+                    d["markdown"] = strip_markdown_links(d["markdown"])
         result = {
             "crawled_at": _format_timestamp(),
             "documents": doc_dicts,
@@ -171,12 +239,12 @@ def _format_output(
         }
         if stats:
             result["stats"] = stats
-        return json.dumps(result, indent=2, ensure_ascii=False)
+        return dumps_json(result)
     else:
         # Markdown format
         output = _format_multiple_docs_markdown(docs)
         if remove_links:
-            output = _strip_markdown_links(output)
+            output = strip_markdown_links(output)
         return output
 
 
@@ -185,7 +253,16 @@ def _format_output(
 # =============================================================================
 
 
-@mcp.tool
+def _storage_state_key(storage_state: str) -> _StorageStateKey:
+    """Return the crawl-cache identity of a storage_state file.
+
+    Raises OSError when the file cannot be stat'ed.
+    """
+    path = canonicalize_path(storage_state.strip())
+    st = path.stat()
+    return (str(path), st.st_mtime_ns, st.st_size)
+
+
 async def crawl(
     urls: List[str],
     output_format: str = "markdown",
@@ -193,6 +270,7 @@ async def crawl(
     remove_links: bool = False,
     dedup_mode: str = "exact",
     storage_state: Optional[str] = None,
+    use_cache: bool = True,
 ):
     """
     Crawl one or more web pages and extract their content as markdown.
@@ -206,6 +284,8 @@ async def crawl(
         remove_links: Remove all links from the markdown output (default: false)
         dedup_mode: Markdown dedup mode - "exact" (default) or "off"
         storage_state: Path to Playwright storage_state JSON for authenticated crawling
+        use_cache: Reuse successful results for the same URL and settings from
+            the last 5 minutes instead of re-crawling (default: true)
 
     Returns:
         Crawled content in the specified format.
@@ -226,43 +306,69 @@ async def crawl(
     from . import crawl_page_async, crawl_pages_async
 
     # Validate output format
-    try:
-        fmt = OutputFormat(output_format.lower())
-    except ValueError:
-        fmt = OutputFormat.markdown
+    fmt = _OUTPUT_FORMATS.get(output_format.lower(), OutputFormat.markdown)
 
-    LOGGER.info("Crawling %d URL(s)...", len(urls))
     auth = {"storage_state": storage_state} if storage_state else None
 
-    if len(urls) == 1:
+    state_key: Optional[_StorageStateKey] = None
+    cacheable = True
+    if storage_state:
         try:
-            doc = await crawl_page_async(urls[0], dedup_mode=dedup_mode, auth=auth)
-            docs = [doc]
+            state_key = _storage_state_key(storage_state)
+        except OSError:
+            # Missing/unreadable auth input: bypass the cache and let the
+            # crawl report the error.
+            cacheable = False
+
+    # Each distinct URL is crawled at most once per call; cached and fetched
+    # documents are mapped back onto the requested order (and repeats) below.
+    by_url: Dict[str, CrawledDocument] = {}
+    unique_urls = list(dict.fromkeys(urls))
+    if use_cache and cacheable:
+        for url in unique_urls:
+            doc = _CRAWL_CACHE.get((url, dedup_mode, state_key))
+            if doc is not None:
+                by_url[url] = doc
+    pending = [url for url in unique_urls if url not in by_url]
+    LOGGER.info("Crawling %d URL(s) (%d cached)...", len(pending), len(by_url))
+
+    if not pending:
+        fetched: List[CrawledDocument] = []
+    elif len(pending) == 1:
+        try:
+            doc = await crawl_page_async(pending[0], dedup_mode=dedup_mode, auth=auth)
+            fetched = [doc]
         except Exception as exc:
-            docs = [
+            fetched = [
                 CrawledDocument(
-                    request_url=urls[0],
-                    final_url=urls[0],
+                    request_url=pending[0],
+                    final_url=pending[0],
                     status="failed",
                     markdown="",
                     error_message=str(exc),
                 )
             ]
     else:
-        docs = await crawl_pages_async(
-            urls,
+        fetched = await crawl_pages_async(
+            pending,
             concurrency=concurrency,
             dedup_mode=dedup_mode,
             auth=auth,
         )
 
-    successful = sum(1 for d in docs if d.status == "success")
-    LOGGER.info("Completed: %d/%d successful", successful, len(docs))
+    for url, doc in zip(pending, fetched):
+        by_url[url] = doc
+        if cacheable and doc.status == "success":
+            _CRAWL_CACHE.set((url, dedup_mode, state_key), doc)
+    docs = [by_url[url] for url in urls]
+
+    if LOGGER.isEnabledFor(logging.INFO):
+        successful = sum(1 for d in docs if d.status == "success")
+        LOGGER.info("Completed: %d/%d successful", successful, len(docs))
 
     return _format_output(docs, fmt, remove_links=remove_links)
 
 
-@mcp.tool
 async def crawl_site(
     url: str,
     max_depth: int = 2,
@@ -310,10 +416,7 @@ async def crawl_site(
     from . import crawl_site_async
 
     # Validate output format
-    try:
-        fmt = OutputFormat(output_format.lower())
-    except ValueError:
-        fmt = OutputFormat.markdown
+    fmt = _OUTPUT_FORMATS.get(output_format.lower(), OutputFormat.markdown)
 
     LOGGER.info(
         "Starting site crawl: %s (max_depth=%d, max_pages=%d)",
@@ -349,12 +452,33 @@ async def crawl_site(
 
 
 def _get_searxng_client() -> httpx.AsyncClient:
-    """Create an httpx client for SearXNG with optional basic auth."""
+    """Return the shared httpx client for SearXNG with optional basic auth.
+
+    One client per event loop and SearXNG URL/credentials is created on
+    first use and reused by every search so that connections stay pooled
+    between calls; HTTP/2 lets concurrent searches share one connection
+    when SearXNG is served over TLS. There is no await between lookup and
+    insert, so concurrent searches on one loop cannot build duplicate
+    clients.
+    """
+    import httpx
+
+    loop = asyncio.get_running_loop()
+    key = (loop, SEARXNG_URL, SEARXNG_USERNAME, SEARXNG_PASSWORD)
+    client = _SEARXNG_CLIENTS.get(key)
+    if client is not None and not client.is_closed:
+        return client
+
+    # Clients from loops that have since closed can be neither reused nor
+    # awaited to close; just forget them.
+    for stale in [k for k in _SEARXNG_CLIENTS if k[0].is_closed()]:
+        del _SEARXNG_CLIENTS[stale]
+
     auth = None
     if SEARXNG_USERNAME and SEARXNG_PASSWORD:
         auth = httpx.BasicAuth(SEARXNG_USERNAME, SEARXNG_PASSWORD)
 
-    return httpx.AsyncClient(
+    client = httpx.AsyncClient(
         base_url=SEARXNG_URL,
         auth=auth,
         headers={
@@ -362,10 +486,50 @@ def _get_searxng_client() -> httpx.AsyncClient:
             "Content-Type": "application/json",
         },
         timeout=30.0,
+        limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+        http2=True,
     )
+    _SEARXNG_CLIENTS[key] = client
+    return client
+
+
+async def _close_searxng_client() -> None:
+    """Close the shared SearXNG clients created on the running loop."""
+    loop = asyncio.get_running_loop()
+    for key in [k for k in _SEARXNG_CLIENTS if k[0] is loop]:
+        await _SEARXNG_CLIENTS.pop(key).aclose()
+
+
+async def _fetch_search(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Query SearXNG's ``/search`` endpoint and parse the JSON response."""
+    client = _get_searxng_client()
+    response = await client.get("/search", params=params)
+    LOGGER.debug("SearXNG responded over %s", response.http_version)
+    response.raise_for_status()
+    return loads_json(response.content)
+
+
+def _forget_search(key: Tuple[Any, ...], task: asyncio.Future) -> None:
+    _SEARCH_INFLIGHT.pop(key, None)
+    if not task.cancelled():
+        # Mark the exception as retrieved in case every caller was cancelled.
+        task.exception()
+
+
+def _coalesced_search(key: Tuple[Any, ...], params: Dict[str, Any]) -> asyncio.Future:
+    """Return the in-flight request for ``key``, starting one if needed.
+
+    The request runs as its own task, so a cancelled caller does not cancel
+    it for the others awaiting the same result.
+    """
+    task = _SEARCH_INFLIGHT.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_fetch_search(params))
+        task.add_done_callback(functools.partial(_forget_search, key))
+        _SEARCH_INFLIGHT[key] = task
+    return task
 
 
-@mcp.tool
 async def search(
     query: str,
     language: str = "en",
@@ -375,6 +539,7 @@ async def search(
     safesearch: int = 1,
     pageno: int = 1,
     max_results: int = 10,
+    use_cache: bool = True,
 ):
     """
     Search the web using SearXNG metasearch engine.
@@ -388,6 +553,8 @@ async def search(
         safesearch: Safe search level - 0 (off), 1 (moderate), 2 (strict). Default: 1
         pageno: Page number for results (minimum 1). Default: 1
         max_results: Maximum results to return (1-50). Default: 10
+        use_cache: Reuse the response of an identical search from the last
+            30 seconds instead of querying SearXNG again. Default: True
 
     Returns:
         JSON string with search results including:
@@ -411,6 +578,8 @@ async def search(
         # Search in German
         search(query="Rezepte", language="de")
     """
+    import httpx
+
     LOGGER.info("Searching SearXNG for: %s", query)
 
     # Build search parameters
@@ -422,7 +591,7 @@ async def search(
         "pageno": max(1, pageno),
     }
 
-    if time_range and time_range in ("day", "week", "month", "year"):
+    if time_range in _VALID_TIME_RANGES:
         params["time_range"] = time_range
 
     if categories:
@@ -431,21 +600,33 @@ async def search(
     if engines:
         params["engines"] = ",".join(engines)
 
+    cache_key = (
+        SEARXNG_URL,
+        SEARXNG_USERNAME,
+        SEARXNG_PASSWORD,
+        tuple(params.items()),
+    )
     try:
-        async with _get_searxng_client() as client:
-            response = await client.get("/search", params=params)
-            response.raise_for_status()
-            data = response.json()
+        data = _SEARCH_CACHE.get(cache_key) if use_cache else None
+        if data is None:
+            data = await asyncio.shield(_coalesced_search(cache_key, params))
+            _SEARCH_CACHE.set(cache_key, data)
+        else:
+            LOGGER.debug("Serving cached SearXNG response for: %s", query)
 
-        # Limit results
+        # Limit results without touching the cached response
         max_results = min(max(1, max_results), 50)
         if "results" in data:
-            data["results"] = data["results"][:max_results]
-            data["number_of_results"] = len(data["results"])
+            results = data["results"][:max_results]
+            data = {**data, "results": results, "number_of_results": len(results)}
 
         LOGGER.info("Search returned %d results", data.get("number_of_results", 0))
 
-        return json.dumps(data, indent=2, ensure_ascii=False)
+        # Large responses are serialized off the event loop so concurrent tool
+        # calls are not stalled; small ones aren't worth the thread hop.
+        if len(data.get("results", ())) > _THREADED_DUMP_MIN_RESULTS:
+            return await asyncio.to_thread(dumps_json, data)
+        return dumps_json(data)
 
     except httpx.HTTPStatusError as exc:
         if exc.response.status_code == 401:
@@ -526,10 +707,10 @@ Examples:
 
     if args.transport == "http":
         LOGGER.info("Starting MCP server on http://%s:%d/mcp", args.host, args.port)
-        mcp.run(transport="http", host=args.host, port=args.port)
+        _get_mcp().run(transport="http", host=args.host, port=args.port)
     else:
         LOGGER.info("Starting MCP server with STDIO transport")
-        mcp.run(transport="stdio")
+        _get_mcp().run(transport="stdio")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,68 @@
+"""Output helpers shared by the CLI and the MCP server."""
+
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING, Iterable, List, Set, Tuple
+
+if TYPE_CHECKING:
+    from .document import CrawledDocument, Reference
+
+_LINK_RE = re.compile(r"\[([^\]]+)\]\([^)]+\)")
+_URL_RE = re.compile(r"https?://\S+")
+
+
+def strip_markdown_links(text: str) -> str:
+    """Remove markdown links from text, keeping only the link text.
+
+    Converts [text](url) to text and removes standalone URLs.
+    """
+    # Both patterns need a literal "](" or "http", so a plain substring scan
+    # lets link-free text skip the regex passes entirely.
+    if "](" in text:
+        # Replace [text](url) with just text
+        text = _LINK_RE.sub(r"\1", text)
+    if "http" in text:
+        # Remove standalone URLs (http/https)
+        text = _URL_RE.sub("", text)
+    # Clean up any double spaces left behind; each str.replace round halves
+    # the longest remaining run, which beats the regex on typical text.
+    while "  " in text:
+        text = text.replace("  ", " ")
+    return text
+
+
+def _unique_references(references: Iterable[Reference]) -> List[Reference]:
+    """Drop references repeating an earlier ``(href, label)`` pair.
+
+    Navigation, body, and footer often link the same target with the same
+    text; only the first occurrence (and its index) is kept.
+    """
+    seen: Set[Tuple[str, str]] = set()
+    unique: List[Reference] = []
+    for ref in references:
+        key = (ref.href, ref.label)
+        if key in seen:
+            continue
+        seen.add(key)
+        unique.append(ref)
+    return unique
+
+
+def doc_to_dict(doc: CrawledDocument) -> dict:
+    """Convert document to a dict for the JSON serialization helpers.
+
+    ``Reference`` entries are passed through as dataclasses; the helpers in
+    :mod:`crawler.serialization` encode them as ``index``/``href``/``label``
+    objects without building an intermediate dict per reference. Duplicate
+    ``(href, label)`` references are emitted once.
+    """
+    return {
+        "request_url": doc.request_url,
+        "final_url": doc.final_url,
+        "status": doc.status,
+        "markdown": doc.markdown,
+        "error_message": doc.error_message,
+        "metadata": doc.metadata,
+        "references": _unique_references(doc.references),
+    }
@@ -7,7 +7,13 @@ from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from .document import Reference
 
-REFERENCE_LINE = re.compile(r"^⟨(?P<index>\d+)⟩\s*(?P<tail>.+)$")
+# Matches reference lines anywhere in a block; [^\S\n] is "whitespace other
+# than a newline", so leading blanks are skipped without crossing lines. The
+# tail runs to the end of the line and is right-stripped by the caller.
+REFERENCE_LINE = re.compile(
+    r"^[^\S\n]*⟨(?P<index>\d+)⟩[^\S\n]*(?P<tail>\S[^\n]*)",
+    re.MULTILINE,
+)
 
 
 def parse_references(
@@ -22,15 +28,8 @@ def parse_references(
 
 
 def _parse_markdown_block(markdown_block: str) -> Iterable[Reference]:
-    for raw_line in markdown_block.splitlines():
-        line = raw_line.strip()
-        if not line:
-            continue
-        match = REFERENCE_LINE.match(line)
-        if not match:
-            continue
-        rest = match.group("tail").strip()
-        href, label = _split_reference_tail(rest)
+    for match in REFERENCE_LINE.finditer(markdown_block):
+        href, label = _split_reference_tail(match.group("tail").rstrip())
         try:
             yield Reference(index=int(match.group("index")), href=href, label=label)
         except ValueError:
@@ -38,19 +37,16 @@ def _parse_markdown_block(markdown_block: str) -> Iterable[Reference]:
 
 
 def _build_from_links(links: Dict[str, List[Dict[str, Any]]]) -> Iterable[Reference]:
-    seen: set[Tuple[str, str]] = set()
-    merged: List[Tuple[str, str]] = []
+    # Insertion-ordered dict used as an ordered set: re-assigning a key keeps
+    # its first position, so one hash operation dedupes each link.
+    merged: Dict[Tuple[str, str], None] = {}
     for bucket in ("internal", "external"):
-        for entry in links.get(bucket, []) or []:
+        for entry in links.get(bucket) or ():
             href = (entry or {}).get("href")
             if not href:
                 continue
             label = ((entry or {}).get("text") or href).strip()
-            key = (href, label)
-            if key in seen:
-                continue
-            seen.add(key)
-            merged.append(key)
+            merged[href, label] = None
     for index, (href, label) in enumerate(merged, start=1):
         yield Reference(index=index, href=href, label=label)
 
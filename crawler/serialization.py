@@ -0,0 +1,74 @@
+"""JSON serialization helpers with an optional orjson fast path."""
+
+from __future__ import annotations
+
+import dataclasses
+import json
+from pathlib import Path
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore[assignment]
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+
+
+def _json_default(obj: Any) -> Any:
+    """Serialize dataclasses (e.g. ``Reference``) for the stdlib encoder."""
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps_json_bytes(obj: Any) -> bytes:
+    """Serialize ``obj`` as indented UTF-8 JSON bytes.
+
+    Uses orjson when installed and falls back to the standard library for
+    payloads orjson rejects (e.g. integers wider than 64 bits).
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=_ORJSON_OPTIONS)
+        except TypeError:
+            pass
+    return json.dumps(
+        obj, indent=2, ensure_ascii=False, default=_json_default
+    ).encode("utf-8")
+
+
+def dumps_json(obj: Any) -> str:
+    """Serialize ``obj`` as an indented JSON string."""
+    if orjson is None:
+        return json.dumps(obj, indent=2, ensure_ascii=False, default=_json_default)
+    return dumps_json_bytes(obj).decode("utf-8")
+
+
+def write_json(path: Path, obj: Any) -> None:
+    """Write ``obj`` as indented UTF-8 JSON to ``path``.
+
+    With orjson the document is encoded to bytes in one call and written at
+    once; the standard-library fallback streams it into the open file.
+    """
+    if orjson is None:
+        with path.open("w", encoding="utf-8") as fh:
+            json.dump(obj, fh, indent=2, ensure_ascii=False, default=_json_default)
+        return
+    path.write_bytes(dumps_json_bytes(obj))
+
+
+def loads_json(data: Union[bytes, str]) -> Any:
+    """Parse JSON from ``bytes`` or ``str``.
+
+    Uses orjson when installed. Input orjson rejects but the standard library
+    accepts (``NaN`` literals) is retried with :func:`json.loads`, so invalid
+    documents still raise :class:`json.JSONDecodeError`.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
@@ -3,13 +3,16 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import re
+import stat
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from time import monotonic
 from typing import Any, Awaitable, Callable, Literal, Optional
 
+from .auth import canonicalize_path
+from .serialization import write_json
+
 CaptureStatus = Literal["success", "timeout", "abort"]
 
 
@@ -44,20 +47,28 @@ class CdpSessionEntry:
 ConfirmCallback = Callable[[str], bool | Awaitable[bool]]
 
 
-def _canonicalize_output_path(path_value: str) -> Path:
-    path = Path(path_value).expanduser()
-    if not path.is_absolute():
-        path = Path.cwd() / path
-    return path.resolve(strict=False)
+@lru_cache(maxsize=128)
+def _compile_completion_pattern(pattern: str) -> re.Pattern[str]:
+    return re.compile(pattern)
 
 
 def _validate_output_target(path: Path, *, overwrite: bool) -> None:
-    if path.exists() and not overwrite:
+    try:
+        st = path.stat()
+    except (FileNotFoundError, NotADirectoryError):
+        # Missing, or a parent component is a file: nothing to overwrite.
+        return
+    except OSError as exc:
+        raise SessionCaptureConfigError(
+            f"storage_state output path is not accessible: {path} ({exc})"
+        ) from exc
+
+    if not overwrite:
         raise SessionCaptureConfigError(
             f"storage_state output already exists: {path} (use overwrite=True to replace)"
         )
 
-    if path.exists() and path.is_dir():
+    if stat.S_ISDIR(st.st_mode):
         raise SessionCaptureConfigError(
             f"storage_state output path is a directory: {path}"
         )
@@ -68,12 +79,24 @@ def _write_storage_state(path: Path, payload: Any) -> None:
         raise SessionCaptureError("Captured storage_state must be a JSON object")
 
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8")
+    write_json(path, payload)
+
 
-    # Deterministic post-write validation
-    parsed = json.loads(path.read_text(encoding="utf-8"))
-    if not isinstance(parsed, dict):
-        raise SessionCaptureError("Written storage_state is not a JSON object")
+@lru_cache(maxsize=1)
+def _import_async_playwright() -> Callable[[], Any]:
+    from playwright.async_api import async_playwright
+
+    return async_playwright
+
+
+def _get_async_playwright(purpose: str) -> Callable[[], Any]:
+    """Return ``async_playwright``, importing it on first use only."""
+    try:
+        return _import_async_playwright()
+    except Exception as exc:  # pragma: no cover - environment dependent
+        raise SessionCaptureError(
+            f"Playwright is required for {purpose}. Install browsers with 'playwright install chromium'."
+        ) from exc
 
 
 def _normalize_cdp_url(cdp_url: str) -> str:
@@ -86,12 +109,7 @@ async def list_cdp_sessions_async(cdp_url: str) -> list[CdpSessionEntry]:
     """List selectable sessions from a running browser via CDP."""
     target_url = _normalize_cdp_url(cdp_url)
 
-    try:
-        from playwright.async_api import async_playwright
-    except Exception as exc:  # pragma: no cover - environment dependent
-        raise SessionCaptureError(
-            "Playwright is required for CDP session listing. Install browsers with 'playwright install chromium'."
-        ) from exc
+    async_playwright = _get_async_playwright("CDP session listing")
 
     sessions: list[CdpSessionEntry] = []
 
@@ -104,8 +122,16 @@ async def list_cdp_sessions_async(cdp_url: str) -> list[CdpSessionEntry]:
             ) from exc
 
         try:
-            for context_index, context in enumerate(browser.contexts):
-                pages = list(context.pages)
+            contexts = [list(context.pages) for context in browser.contexts]
+            # Fetch every page title concurrently: one CDP round-trip per
+            # page would otherwise be paid sequentially.
+            titles = iter(
+                await asyncio.gather(
+                    *(page.title() for pages in contexts for page in pages),
+                    return_exceptions=True,
+                )
+            )
+            for context_index, pages in enumerate(contexts):
                 if not pages:
                     sessions.append(
                         CdpSessionEntry(
@@ -118,18 +144,13 @@ async def list_cdp_sessions_async(cdp_url: str) -> list[CdpSessionEntry]:
                     continue
 
                 for page_index, page in enumerate(pages):
-                    title: Optional[str] = None
-                    try:
-                        title = await page.title()
-                    except Exception:
-                        title = None
-
+                    title = next(titles)
                     sessions.append(
                         CdpSessionEntry(
                             context_index=context_index,
                             page_index=page_index,
                             url=page.url or "",
-                            title=title,
+                            title=None if isinstance(title, BaseException) else title,
                         )
                     )
         finally:
@@ -155,15 +176,10 @@ async def export_cdp_storage_state_async(
         )
 
     target_url = _normalize_cdp_url(cdp_url)
-    output = _canonicalize_output_path(output_path)
+    output = canonicalize_path(output_path)
     _validate_output_target(output, overwrite=overwrite)
 
-    try:
-        from playwright.async_api import async_playwright
-    except Exception as exc:  # pragma: no cover - environment dependent
-        raise SessionCaptureError(
-            "Playwright is required for CDP export. Install browsers with 'playwright install chromium'."
-        ) from exc
+    async_playwright = _get_async_playwright("CDP export")
 
     final_url: Optional[str] = None
 
@@ -207,24 +223,105 @@ async def export_cdp_storage_state_async(
     )
 
 
+async def _wait_for_completion(
+    page: Any,
+    pattern: re.Pattern[str],
+    *,
+    timeout_seconds: float,
+    poll_interval: float,
+    confirm_callback: Optional[ConfirmCallback],
+    started_at: Optional[float] = None,
+) -> dict[str, Any]:
+    """Wait until ``page`` reaches a confirmed completion URL.
+
+    The URL is re-checked every ``poll_interval`` seconds, and immediately
+    whenever the main frame navigates or the page closes. The timeout is a
+    single loop timer that wakes the wait, so no clock is read per check.
+    It fires ``timeout_seconds`` after ``started_at`` (loop time; defaults to
+    now), so time spent launching the browser counts toward the timeout.
+    """
+    wake = asyncio.Event()
+    timed_out = False
+
+    def _on_deadline() -> None:
+        nonlocal timed_out
+        timed_out = True
+        wake.set()
+
+    def _on_frame_navigated(frame: Any) -> None:
+        if frame.parent_frame is None:
+            wake.set()
+
+    def _on_close(_page: Any) -> None:
+        wake.set()
+
+    page.on("framenavigated", _on_frame_navigated)
+    page.on("close", _on_close)
+    loop = asyncio.get_running_loop()
+    if started_at is None:
+        started_at = loop.time()
+    deadline_handle = loop.call_at(started_at + timeout_seconds, _on_deadline)
+    try:
+        while True:
+            # Clear before checking so an event arriving mid-check is not lost.
+            wake.clear()
+            if page.is_closed():
+                return {
+                    "status": "abort",
+                    "message": "Capture aborted: browser page was closed before completion.",
+                    "final_url": None,
+                }
+
+            current_url = page.url or ""
+            if pattern.search(current_url):
+                confirmed = True
+                if confirm_callback is not None:
+                    decision = confirm_callback(current_url)
+                    confirmed = (
+                        await decision
+                        if asyncio.iscoroutine(decision)
+                        else bool(decision)
+                    )
+
+                if confirmed:
+                    return {
+                        "status": "success",
+                        "message": "Capture completed and storage_state collected.",
+                        "final_url": current_url,
+                    }
+
+            if timed_out:
+                return {
+                    "status": "timeout",
+                    "message": (
+                        "Capture timed out before completion URL was observed "
+                        f"(timeout={timeout_seconds}s)."
+                    ),
+                    "final_url": current_url,
+                }
+
+            try:
+                await asyncio.wait_for(wake.wait(), timeout=poll_interval)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        deadline_handle.cancel()
+        page.remove_listener("framenavigated", _on_frame_navigated)
+        page.remove_listener("close", _on_close)
+
+
 async def _execute_capture_flow(
     *,
     start_url: Optional[str],
-    completion_url_pattern: str,
+    completion_pattern: re.Pattern[str],
     timeout_seconds: float,
     poll_interval: float,
     headless: bool,
     confirm_callback: Optional[ConfirmCallback],
 ) -> dict[str, Any]:
-    try:
-        from playwright.async_api import async_playwright
-    except Exception as exc:  # pragma: no cover - environment dependent
-        raise SessionCaptureError(
-            "Playwright is required for session capture. Install browsers with 'playwright install chromium'."
-        ) from exc
-
-    pattern = re.compile(completion_url_pattern)
-    started = monotonic()
+    async_playwright = _get_async_playwright("session capture")
+    # The timeout covers the whole capture, including launch and navigation.
+    started_at = asyncio.get_running_loop().time()
 
     async with async_playwright() as playwright:
         browser = await playwright.chromium.launch(headless=headless)
@@ -235,45 +332,17 @@ async def _execute_capture_flow(
             if start_url:
                 await page.goto(start_url)
 
-            while True:
-                if page.is_closed():
-                    return {
-                        "status": "abort",
-                        "message": "Capture aborted: browser page was closed before completion.",
-                        "final_url": None,
-                    }
-
-                current_url = page.url or ""
-                if pattern.search(current_url):
-                    confirmed = True
-                    if confirm_callback is not None:
-                        decision = confirm_callback(current_url)
-                        confirmed = (
-                            await decision
-                            if asyncio.iscoroutine(decision)
-                            else bool(decision)
-                        )
-
-                    if confirmed:
-                        storage_state = await context.storage_state()
-                        return {
-                            "status": "success",
-                            "message": "Capture completed and storage_state collected.",
-                            "final_url": current_url,
-                            "storage_state": storage_state,
-                        }
-
-                if (monotonic() - started) >= timeout_seconds:
-                    return {
-                        "status": "timeout",
-                        "message": (
-                            "Capture timed out before completion URL was observed "
-                            f"(timeout={timeout_seconds}s)."
-                        ),
-                        "final_url": current_url,
-                    }
-
-                await asyncio.sleep(poll_interval)
+            flow = await _wait_for_completion(
+                page,
+                completion_pattern,
+                timeout_seconds=timeout_seconds,
+                poll_interval=poll_interval,
+                confirm_callback=confirm_callback,
+                started_at=started_at,
+            )
+            if flow["status"] == "success":
+                flow["storage_state"] = await context.storage_state()
+            return flow
         finally:
             await browser.close()
 
@@ -296,18 +365,25 @@ async def capture_session_async(
     if not completion_url_pattern or not completion_url_pattern.strip():
         raise SessionCaptureConfigError("completion_url_pattern must be provided")
 
+    try:
+        completion_pattern = _compile_completion_pattern(completion_url_pattern)
+    except re.error as exc:
+        raise SessionCaptureConfigError(
+            f"completion_url_pattern is not a valid regular expression: {exc}"
+        ) from exc
+
     if timeout_seconds <= 0:
         raise SessionCaptureConfigError("timeout_seconds must be greater than 0")
 
     if poll_interval <= 0:
         raise SessionCaptureConfigError("poll_interval must be greater than 0")
 
-    output = _canonicalize_output_path(output_path)
+    output = canonicalize_path(output_path)
     _validate_output_target(output, overwrite=overwrite)
 
     flow = await _execute_capture_flow(
         start_url=start_url,
-        completion_url_pattern=completion_url_pattern,
+        completion_pattern=completion_pattern,
         timeout_seconds=timeout_seconds,
         poll_interval=poll_interval,
         headless=headless,
@@ -6,13 +6,14 @@ import asyncio
 import logging
 from dataclasses import dataclass, field
 from functools import lru_cache
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import urlparse
 
 import tldextract
 from crawl4ai import AsyncWebCrawler, BrowserConfig
 from crawl4ai.deep_crawling.bfs_strategy import BFSDeepCrawlStrategy, FilterChain
 from crawl4ai.deep_crawling.filters import DomainFilter
+from crawl4ai.models import CrawlResult, CrawlResultContainer
 
 from .builder import build_document_from_result
 from .auth import AuthInput, resolve_auth
@@ -21,6 +22,10 @@ from .document import CrawledDocument
 
 LOGGER = logging.getLogger(__name__)
 
+# Resolve suffixes from the bundled public-suffix snapshot only: no network
+# fetch of the live list and no on-disk cache lookups on the first crawl.
+_TLD_EXTRACT = tldextract.TLDExtract(suffix_list_urls=(), cache_dir=None)
+
 
 @dataclass
 class SiteCrawlOptions:
@@ -48,12 +53,12 @@ def _normalize_host(host: Optional[str]) -> str:
     return host.split(":")[0].lower()
 
 
-@lru_cache(maxsize=256)
+@lru_cache(maxsize=2048)
 def _registrable_domain(host: str) -> Optional[str]:
     """Extract the registrable domain from a hostname."""
     if not host:
         return None
-    extracted = tldextract.extract(host)
+    extracted = _TLD_EXTRACT(host)
     if not extracted.domain or not extracted.suffix:
         return host
     domain = ".".join(part for part in (extracted.domain, extracted.suffix) if part)
@@ -89,10 +94,11 @@ async def crawl_site_async(
     # Build domain filters
     filters = []
     if seed_host:
-        allowed_hosts = {seed_host}
+        # DomainFilter builds its own frozenset, so no sorting is needed here.
+        allowed_hosts: Tuple[str, ...] = (seed_host,)
         if include_subdomains and registrable and registrable != seed_host:
-            allowed_hosts.add(registrable)
-        filters.append(DomainFilter(allowed_domains=sorted(allowed_hosts)))
+            allowed_hosts += (registrable,)
+        filters.append(DomainFilter(allowed_domains=allowed_hosts))
 
     filter_chain = FilterChain(filters)
 
@@ -116,9 +122,11 @@ async def crawl_site_async(
     config.stream = False
     config.exclude_external_links = not include_subdomains
 
-    documents: List[CrawledDocument] = []
-    seen_urls: Set[str] = set()
+    # Keyed by request_url: deduplicates and keeps crawl order in one table.
+    docs_by_url: Dict[str, CrawledDocument] = {}
     errors: List[Dict[str, str]] = []
+    successful_pages = 0
+    failed_pages = 0
 
     resolved_auth = resolve_auth(auth)
     browser_cfg = BrowserConfig(
@@ -144,13 +152,12 @@ async def crawl_site_async(
                 continue
 
             # Deduplicate by request_url
-            if document.request_url in seen_urls:
+            if document.request_url in docs_by_url:
                 continue
-            seen_urls.add(document.request_url)
-
-            documents.append(document)
+            docs_by_url[document.request_url] = document
 
             if document.status == "failed":
+                failed_pages += 1
                 errors.append(
                     {
                         "url": document.request_url,
@@ -159,21 +166,24 @@ async def crawl_site_async(
                     }
                 )
             else:
+                if document.status == "success":
+                    successful_pages += 1
                 LOGGER.debug(
                     "Crawled %s (%d/%d)",
                     document.request_url,
-                    len(documents),
+                    len(docs_by_url),
                     max_pages,
                 )
 
-            if len(documents) >= max_pages:
+            if len(docs_by_url) >= max_pages:
                 LOGGER.info("Reached page limit of %d", max_pages)
                 break
 
+    documents = list(docs_by_url.values())
     stats = {
         "total_pages": len(documents),
-        "successful_pages": sum(1 for d in documents if d.status == "success"),
-        "failed_pages": sum(1 for d in documents if d.status == "failed"),
+        "successful_pages": successful_pages,
+        "failed_pages": failed_pages,
         "error_count": len(errors),
     }
 
@@ -204,10 +214,6 @@ def crawl_site(
 
 async def _iterate_results(result):
     """Iterate over crawl results, handling different result types."""
-    import inspect
-
-    from crawl4ai.models import CrawlResult, CrawlResultContainer
-
     # Handle list of results (returned when stream=False)
     if isinstance(result, list):
         for item in result:
@@ -219,12 +225,13 @@ async def _iterate_results(result):
                 yield item
         return
 
+    # Checked before __aiter__: containers are async-iterable too.
     if isinstance(result, CrawlResultContainer):
         for item in result:
             yield item
         return
 
-    if inspect.isasyncgen(result):
+    if hasattr(result, "__aiter__"):
         async for item in result:
             yield item
         return
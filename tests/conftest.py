@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def storage_state_file(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """A valid, read-only storage_state JSON file shared by the whole session."""
+    path = tmp_path_factory.mktemp("auth") / "state.json"
+    path.write_text('{"cookies": [], "origins": []}', encoding="utf-8")
+    return path
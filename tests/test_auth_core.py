@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import json
 from types import SimpleNamespace
 
 import pytest
@@ -10,16 +9,35 @@ import crawler.site as site_module
 from crawler.auth import AuthConfigError, ResolvedAuth, resolve_auth
 
 
-def test_resolve_auth_accepts_valid_storage_state(tmp_path) -> None:
-    storage_state = tmp_path / "state.json"
-    storage_state.write_text(
-        json.dumps({"cookies": [], "origins": []}), encoding="utf-8"
-    )
+class _DummyCrawler:
+    """AsyncWebCrawler stand-in recording its browser config in ``captured``.
+
+    ``arun`` yields one bare result per URL unless ``results`` is set.
+    """
+
+    captured: dict = {}
+    results: list | None = None
+
+    def __init__(self, config=None):
+        self.captured["crawler_config"] = config
+
+    async def __aenter__(self):
+        return self
 
-    resolved = resolve_auth({"storage_state": str(storage_state)})
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+    async def arun(self, url, config):
+        if self.results is not None:
+            return self.results
+        return [SimpleNamespace(url=url)]
+
+
+def test_resolve_auth_accepts_valid_storage_state(storage_state_file) -> None:
+    resolved = resolve_auth({"storage_state": str(storage_state_file)})
 
     assert resolved is not None
-    assert resolved.storage_state == str(storage_state.resolve())
+    assert resolved.storage_state == str(storage_state_file.resolve())
 
 
 def test_resolve_auth_missing_storage_state_file_raises(tmp_path) -> None:
@@ -37,12 +55,9 @@ def test_resolve_auth_invalid_json_raises(tmp_path) -> None:
         resolve_auth({"storage_state": str(storage_state)})
 
 
-def test_resolve_auth_rejects_unsupported_auth_fields(tmp_path) -> None:
-    storage_state = tmp_path / "state.json"
-    storage_state.write_text(json.dumps({}), encoding="utf-8")
-
+def test_resolve_auth_rejects_unsupported_auth_fields(storage_state_file) -> None:
     with pytest.raises(AuthConfigError, match="Unsupported auth fields"):
-        resolve_auth({"storage_state": str(storage_state), "profile": "default"})
+        resolve_auth({"storage_state": str(storage_state_file), "profile": "default"})
 
 
 @pytest.mark.asyncio
@@ -51,20 +66,8 @@ async def test_crawl_page_async_no_auth_keeps_existing_runtime_path(
 ) -> None:
     captured = {"crawler_config": "unset"}
 
-    class DummyCrawler:
-        def __init__(self, config=None):
-            captured["crawler_config"] = config
-
-        async def __aenter__(self):
-            return self
-
-        async def __aexit__(self, exc_type, exc, tb):
-            return False
-
-        async def arun(self, url, config):
-            return [SimpleNamespace(url=url)]
-
-    monkeypatch.setattr(crawler, "AsyncWebCrawler", DummyCrawler)
+    monkeypatch.setattr(_DummyCrawler, "captured", captured)
+    monkeypatch.setattr(crawler, "AsyncWebCrawler", _DummyCrawler)
     monkeypatch.setattr(
         crawler,
         "build_document_from_result",
@@ -82,31 +85,18 @@ async def test_crawl_page_async_no_auth_keeps_existing_runtime_path(
 @pytest.mark.asyncio
 async def test_crawl_page_async_threads_storage_state_to_browser_config(
     monkeypatch: pytest.MonkeyPatch,
-    tmp_path,
+    storage_state_file,
 ) -> None:
-    storage_state = tmp_path / "state.json"
-    storage_state.write_text(json.dumps({}), encoding="utf-8")
+    storage_state = storage_state_file
     captured: dict[str, object] = {}
 
     def fake_browser_config(**kwargs):
         captured["browser_kwargs"] = kwargs
         return SimpleNamespace(**kwargs)
 
-    class DummyCrawler:
-        def __init__(self, config=None):
-            captured["crawler_config"] = config
-
-        async def __aenter__(self):
-            return self
-
-        async def __aexit__(self, exc_type, exc, tb):
-            return False
-
-        async def arun(self, url, config):
-            return [SimpleNamespace(url=url)]
-
     monkeypatch.setattr(crawler, "BrowserConfig", fake_browser_config)
-    monkeypatch.setattr(crawler, "AsyncWebCrawler", DummyCrawler)
+    monkeypatch.setattr(_DummyCrawler, "captured", captured)
+    monkeypatch.setattr(crawler, "AsyncWebCrawler", _DummyCrawler)
     monkeypatch.setattr(
         crawler,
         "build_document_from_result",
@@ -141,21 +131,10 @@ async def test_crawl_site_async_threads_resolved_storage_state(
         captured["browser_kwargs"] = kwargs
         return SimpleNamespace(**kwargs)
 
-    class DummyCrawler:
-        def __init__(self, config=None):
-            captured["crawler_config"] = config
-
-        async def __aenter__(self):
-            return self
-
-        async def __aexit__(self, exc_type, exc, tb):
-            return False
-
-        async def arun(self, url, config):
-            return []
-
     monkeypatch.setattr(site_module, "BrowserConfig", fake_browser_config)
-    monkeypatch.setattr(site_module, "AsyncWebCrawler", DummyCrawler)
+    monkeypatch.setattr(_DummyCrawler, "captured", captured)
+    monkeypatch.setattr(_DummyCrawler, "results", [])
+    monkeypatch.setattr(site_module, "AsyncWebCrawler", _DummyCrawler)
 
     result = await site_module.crawl_site_async("https://example.com", auth={})
 
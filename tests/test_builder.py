@@ -3,7 +3,13 @@ from __future__ import annotations
 from types import SimpleNamespace
 from typing import Any
 
-from crawler.builder import build_document_from_result
+import pytest
+
+from crawler.builder import (
+    _derive_failure_reason,
+    _extract_requested_url,
+    build_document_from_result,
+)
 
 
 def _crawl_result(markdown: str) -> Any:
@@ -81,3 +87,46 @@ B"""
     assert doc.metadata["dedup_guardrail_checked"] is False
     assert doc.metadata["dedup_guardrail_triggered"] is False
     assert doc.metadata["dedup_guardrail_reason"] == "dedup-inactive"
+
+
+@pytest.mark.parametrize(
+    ("metadata", "default", "expected"),
+    [
+        ({"requested_url": "https://a.com"}, "fallback", "https://a.com"),
+        ({"request_url": "https://b.com"}, "fallback", "https://b.com"),
+        ({"source_url": "  https://c.com  "}, "fallback", "https://c.com"),
+        (
+            {"requested_url": "   ", "request_url": "https://b.com"},
+            "fallback",
+            "https://b.com",
+        ),
+        ({"requested_url": 42}, "fallback", "fallback"),
+        ({}, None, ""),
+    ],
+)
+def test_extract_requested_url(
+    metadata: dict, default: str | None, expected: str
+) -> None:
+    assert _extract_requested_url(metadata, default) == expected
+
+
+@pytest.mark.parametrize(
+    ("fields", "expected"),
+    [
+        ({"error_message": "net::ERR_FAILED", "status_code": 500}, "net::ERR_FAILED"),
+        ({"status_code": 404}, "HTTP 404"),
+        ({"metadata": {"status_code": 503}}, "HTTP 503"),
+        ({"metadata": {"crawl_last_error": "timeout"}}, "timeout"),
+        (
+            {"metadata": {"requested_url": "https://a.com"}},
+            "Crawler returned no content for https://a.com",
+        ),
+        ({}, "Crawler returned no content"),
+    ],
+)
+def test_derive_failure_reason(fields: dict, expected: str) -> None:
+    result = SimpleNamespace(
+        **{"error_message": None, "status_code": None, "metadata": None, **fields}
+    )
+
+    assert _derive_failure_reason(result) == expected
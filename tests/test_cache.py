@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from crawler.cache import TTLCache
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_ttl_cache_expires_entries() -> None:
+    clock = _Clock()
+    cache: TTLCache[str, int] = TTLCache(maxsize=4, ttl=10, timer=clock)
+
+    cache.set("a", 1)
+    clock.now = 9.9
+    assert cache.get("a") == 1
+
+    clock.now = 10.0
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_ttl_cache_evicts_oldest_when_full() -> None:
+    clock = _Clock()
+    cache: TTLCache[str, int] = TTLCache(maxsize=2, ttl=10, timer=clock)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("a", 3)
+    cache.set("c", 4)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 3
+    assert cache.get("c") == 4
@@ -1,6 +1,11 @@
 from __future__ import annotations
 
 import argparse
+import io
+import json
+import os
+import sys
+from pathlib import Path
 from types import SimpleNamespace
 
 import pytest
@@ -168,3 +173,227 @@ async def test_run_crawl_async_auth_error_propagates_from_resolver(
 
     with pytest.raises(ValueError, match="Auth storage_state file not found"):
         await cli._run_crawl_async(args)
+
+
+def test_write_output_json_array_to_directory(tmp_path) -> None:
+    docs = [_doc(), _doc()]
+    docs[1].final_url = "https://example.com/über"
+    docs[1].markdown = "# über"
+
+    cli._write_output(docs, str(tmp_path / "out"), json_output=True)
+
+    written = json.loads(
+        (tmp_path / "out" / "crawl_results.json").read_text(encoding="utf-8")
+    )
+    assert [doc["final_url"] for doc in written] == [
+        "https://example.com",
+        "https://example.com/über",
+    ]
+    assert written[1]["markdown"] == "# über"
+
+
+def test_write_output_markdown_files_to_directory(tmp_path) -> None:
+    docs = [_doc(), _doc()]
+    docs[1].final_url = "https://example.com/guide/intro"
+    docs[1].markdown = "# intro"
+
+    cli._write_output(docs, str(tmp_path), json_output=False)
+
+    assert (tmp_path / "example_com_index.md").read_text(encoding="utf-8") == "# ok"
+    assert (tmp_path / "example_com_guide_intro.md").read_text(
+        encoding="utf-8"
+    ) == "# intro"
+
+
+def test_write_output_single_markdown_file_is_utf8(
+    monkeypatch: pytest.MonkeyPatch, tmp_path
+) -> None:
+    # Simulate a cp1252 locale: text writes without an explicit encoding
+    # would fail on characters outside that code page.
+    original_write_text = Path.write_text
+
+    def cp1252_write_text(self, data, encoding=None, *args, **kwargs):
+        return original_write_text(self, data, encoding or "cp1252", *args, **kwargs)
+
+    monkeypatch.setattr(Path, "write_text", cp1252_write_text)
+    doc = _doc()
+    doc.markdown = "# Überblick → 日本語"
+
+    cli._write_output([doc], str(tmp_path / "page.md"), json_output=False)
+
+    assert (tmp_path / "page.md").read_bytes() == "# Überblick → 日本語".encode("utf-8")
+
+
+@pytest.mark.parametrize(
+    ("url", "expected"),
+    [
+        ("https://example.com", "example_com_index"),
+        ("https://example.com:8080/docs/page.html", "example_com_8080_docs_page.html"),
+        ("https://example.com/a/b/?q=1#frag", "example_com_a_b"),
+        ("https://example.com/a;params", "example_com_a"),
+    ],
+)
+def test_url_to_filename(url: str, expected: str) -> None:
+    assert cli._url_to_filename(url) == expected
+
+
+def test_write_output_json_removes_links(capsys) -> None:
+    doc = _doc()
+    doc.markdown = "See [docs](https://example.com/docs) at https://example.com"
+
+    cli._write_output([doc], None, json_output=True, remove_links=True)
+
+    assert json.loads(capsys.readouterr().out)["markdown"] == "See docs at "
+
+
+def test_load_config_runs_once_per_process(monkeypatch, tmp_path) -> None:
+    env_file = tmp_path / ".env"
+    env_file.write_text("SEARXNCRAWL_TEST_VALUE=first\n")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("SEARXNCRAWL_TEST_VALUE", raising=False)
+    monkeypatch.setattr(cli, "_config_loaded", False)
+    monkeypatch.setattr(cli, "_loaded_env_file", None)
+
+    cli._load_config()
+    env_file.write_text("SEARXNCRAWL_TEST_VALUE=second\n")
+    monkeypatch.delenv("SEARXNCRAWL_TEST_VALUE")
+    cli._load_config()
+
+    assert cli._loaded_env_file == env_file
+    assert "SEARXNCRAWL_TEST_VALUE" not in os.environ
+
+
+def test_parse_crawl_args_reuses_parser_without_sharing_state() -> None:
+    first = cli._parse_crawl_args(["https://a.example", "--dedup-mode", "off"])
+    second = cli._parse_crawl_args(["https://b.example"])
+
+    assert cli._build_crawl_parser() is cli._build_crawl_parser()
+    assert first.urls == ["https://a.example"]
+    assert second.urls == ["https://b.example"]
+    assert second.dedup_mode == "exact"
+
+
+def test_print_bytes_writes_utf8_to_stdout(capsys) -> None:
+    cli._print_bytes("# Über".encode("utf-8"))
+
+    assert capsys.readouterr().out == "# Über\n"
+
+
+def test_print_bytes_falls_back_without_binary_buffer(monkeypatch) -> None:
+    stream = io.StringIO()
+    monkeypatch.setattr(sys, "stdout", stream)
+
+    cli._print_bytes(b"plain")
+
+    assert stream.getvalue() == "plain\n"
+
+
+def test_write_output_last_doc_wins_for_same_filename(tmp_path) -> None:
+    docs = [_doc(), _doc()]
+    docs[0].markdown = "# first, and longer than the second"
+    docs[1].markdown = "# second"
+
+    cli._write_output(docs, str(tmp_path), json_output=False)
+
+    assert (tmp_path / "example_com_index.md").read_text(encoding="utf-8") == (
+        "# second"
+    )
+
+
+@pytest.mark.asyncio
+async def test_run_crawl_async_streams_markdown_into_output_directory(
+    monkeypatch: pytest.MonkeyPatch, tmp_path
+) -> None:
+    async def fake_crawl_pages_async(
+        urls, *, concurrency=3, dedup_mode="exact", auth=None, on_document=None
+    ):
+        docs = []
+        for url in urls:
+            doc = _doc()
+            doc.final_url = url
+            doc.markdown = f"see [page]({url})"
+            await on_document(doc)
+            docs.append(doc)
+        return docs
+
+    def fail_write_output(*args, **kwargs):
+        raise AssertionError("pages should already be written")
+
+    monkeypatch.setattr(crawler, "crawl_pages_async", fake_crawl_pages_async)
+    monkeypatch.setattr(cli, "_write_output", fail_write_output)
+
+    args = argparse.Namespace(
+        urls=["https://example.com/a", "https://example.com/b"],
+        site=False,
+        concurrency=3,
+        dedup_mode="exact",
+        storage_state=None,
+        json_output=False,
+        output=f"{tmp_path}/out/",
+        remove_links=True,
+    )
+
+    assert await cli._run_crawl_async(args) == 0
+    out_dir = tmp_path / "out"
+    assert (out_dir / "example_com_a.md").read_text(encoding="utf-8") == (
+        "see page"
+    )
+    assert (out_dir / "example_com_b.md").exists()
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["https://example.com"],
+        ["https://a.example", "https://b.example", "-o", "out/", "--json"],
+        ["--site", "https://example.com", "--max-depth", "3", "--max-pages", "10"],
+        ["https://example.com", "--dedup-mode", "off", "--storage-state", "s.json"],
+        ["-v", "https://example.com", "--remove-links", "--include-subdomains"],
+        ["https://example.com", "--concurrency", "5", "--output", "page.md"],
+    ],
+)
+def test_fast_parse_crawl_args_matches_argparse(argv: list[str]) -> None:
+    fast = cli._fast_parse_crawl_args(argv)
+
+    assert fast is not None
+    assert vars(fast) == vars(cli._build_crawl_parser().parse_args(argv))
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        [],
+        ["--help"],
+        ["https://example.com", "--max-depth"],
+        ["https://example.com", "--max-depth", "two"],
+        ["https://example.com", "--dedup-mode", "fuzzy"],
+        ["https://example.com", "--output=page.md"],
+        ["https://example.com", "--max-d", "3"],
+        ["https://a.example", "--json", "https://b.example"],
+    ],
+)
+def test_fast_parse_crawl_args_defers_to_argparse(argv: list[str]) -> None:
+    assert cli._fast_parse_crawl_args(argv) is None
+
+
+def test_fast_parse_crawl_tables_match_parser() -> None:
+    flags: dict[str, str] = {}
+    options: dict[str, tuple] = {}
+    defaults: dict[str, object] = {}
+    choices: dict[str, tuple] = {}
+    for action in cli._build_crawl_parser()._actions:
+        if action.dest in ("help", "urls"):
+            continue
+        defaults[action.dest] = action.default
+        if action.choices:
+            choices[action.dest] = tuple(action.choices)
+        for option in action.option_strings:
+            if isinstance(action, argparse._StoreTrueAction):
+                flags[option] = action.dest
+            else:
+                options[option] = (action.dest, action.type or str)
+
+    assert flags == cli._CRAWL_FLAGS
+    assert options == cli._CRAWL_OPTIONS
+    assert defaults == cli._CRAWL_DEFAULTS
+    assert choices == cli._CRAWL_CHOICES
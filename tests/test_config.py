@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import dataclasses
+import logging
+
+import pytest
+from crawl4ai.async_configs import CacheMode
+
+from crawler.config import (
+    _OVERRIDE_FIELDS,
+    MAIN_SELECTORS,
+    RunConfigOverrides,
+    _convert_cache_mode,
+    build_discovery_run_config,
+    build_markdown_run_config,
+)
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("bypass", CacheMode.BYPASS),
+        ("CacheMode.ENABLED", CacheMode.ENABLED),
+        (" read_only ", CacheMode.READ_ONLY),
+        (None, CacheMode.DISABLED),
+        ("", CacheMode.DISABLED),
+    ],
+)
+def test_convert_cache_mode(value, expected) -> None:
+    assert _convert_cache_mode(value, CacheMode.DISABLED) == expected
+
+
+def test_convert_cache_mode_warns_on_every_unknown_value(caplog) -> None:
+    with caplog.at_level(logging.WARNING, logger="crawler.config"):
+        for _ in range(2):
+            assert _convert_cache_mode("bogus", CacheMode.BYPASS) is CacheMode.BYPASS
+
+    assert len(caplog.records) == 2
+
+
+def test_override_fields_cover_every_override() -> None:
+    handled = {name for name, _ in _OVERRIDE_FIELDS}
+    handled |= {"cache_mode", "target_elements", "excluded_tags"}
+
+    assert handled == {f.name for f in dataclasses.fields(RunConfigOverrides)}
+
+
+def test_apply_overrides_respects_none_and_truthiness() -> None:
+    config = build_markdown_run_config(
+        RunConfigOverrides(
+            verbose=False,
+            mean_delay=0.0,
+            css_selector="",
+            wait_for="css:main",
+            cache_mode="enabled",
+            target_elements=["article"],
+        )
+    )
+
+    assert config.verbose is False
+    assert config.mean_delay == 0.0
+    assert config.css_selector is None
+    assert config.wait_for == "css:main"
+    assert config.cache_mode is CacheMode.ENABLED
+    assert config.target_elements == ["article"]
+    assert config.delay_before_return_html == 0.5
+
+
+@pytest.mark.parametrize(
+    "builder", [build_markdown_run_config, build_discovery_run_config]
+)
+def test_builders_share_frozen_main_selectors(builder) -> None:
+    assert builder().target_elements is MAIN_SELECTORS
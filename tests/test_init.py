@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from types import SimpleNamespace
 
 import pytest
@@ -79,12 +80,10 @@ def test_crawl_site_wrapper_forwards_dedup_mode(
 @pytest.mark.asyncio
 async def test_crawl_pages_async_forwards_auth_to_crawl_page(
     monkeypatch: pytest.MonkeyPatch,
-    tmp_path,
+    storage_state_file,
 ) -> None:
     captured: list[ResolvedAuth | None] = []
-
-    storage_state = tmp_path / "state.json"
-    storage_state.write_text("{}", encoding="utf-8")
+    storage_state = storage_state_file
 
     async def fake_crawl_page_async(url, *, config=None, dedup_mode="exact", auth=None):
         captured.append(auth)
@@ -104,3 +103,155 @@ async def test_crawl_pages_async_forwards_auth_to_crawl_page(
         str(storage_state),
         str(storage_state),
     ]
+
+
+@pytest.mark.asyncio
+async def test_crawl_pages_async_awaits_on_document_per_result(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    seen: list[str] = []
+
+    async def fake_crawl_page_async(url, *, config=None, dedup_mode="exact", auth=None):
+        if url == "https://b":
+            raise RuntimeError("boom")
+        return SimpleNamespace(status="success", request_url=url)
+
+    async def on_document(doc) -> None:
+        seen.append(f"{doc.request_url}:{doc.status}")
+
+    monkeypatch.setattr(crawler, "crawl_page_async", fake_crawl_page_async)
+
+    docs = await crawler.crawl_pages_async(
+        ["https://a", "https://b"], on_document=on_document
+    )
+
+    assert [doc.status for doc in docs] == ["success", "failed"]
+    assert sorted(seen) == ["https://a:success", "https://b:failed"]
+
+
+@pytest.mark.asyncio
+async def test_crawl_pages_async_on_document_error_cancels_remaining_pages(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    crawled: list[str] = []
+    seen: list[str] = []
+
+    async def fake_crawl_page_async(url, *, config=None, dedup_mode="exact", auth=None):
+        crawled.append(url)
+        await asyncio.sleep(0 if url == "https://a" else 0.05)
+        return SimpleNamespace(status="success", request_url=url)
+
+    async def on_document(doc) -> None:
+        seen.append(doc.request_url)
+        raise OSError("disk full")
+
+    monkeypatch.setattr(crawler, "crawl_page_async", fake_crawl_page_async)
+
+    with pytest.raises(OSError, match="disk full"):
+        await crawler.crawl_pages_async(
+            ["https://a", "https://b", "https://c"],
+            concurrency=1,
+            on_document=on_document,
+        )
+    await asyncio.sleep(0.1)
+
+    assert seen == ["https://a"]
+    assert crawled == ["https://a", "https://b"]
+
+
+@pytest.mark.asyncio
+async def test_crawl_pages_async_shares_one_browser_per_batch(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    events: list = []
+
+    class DummyCrawler:
+        def __init__(self, config=None):
+            events.append(("init", config))
+
+        async def start(self):
+            events.append("start")
+            return self
+
+        async def close(self):
+            events.append("close")
+
+        async def arun(self, url, config):
+            events.append(("arun", url))
+            return [SimpleNamespace(url=url)]
+
+    def fake_builder(result, *, dedup_mode="exact"):
+        return SimpleNamespace(status="success", request_url=result.url)
+
+    monkeypatch.setattr(crawler, "AsyncWebCrawler", DummyCrawler)
+    monkeypatch.setattr(crawler, "build_document_from_result", fake_builder)
+
+    docs = await crawler.crawl_pages_async(
+        ["https://a.example", "https://b.example", "https://c.example"],
+        config=object(),
+    )
+
+    assert [d.request_url for d in docs] == [
+        "https://a.example",
+        "https://b.example",
+        "https://c.example",
+    ]
+    assert events[:2] == [("init", None), "start"]
+    assert events.count("start") == 1
+    assert events[-1] == "close"
+    assert crawler._BATCH_CRAWLER.get() is None
+
+
+@pytest.mark.asyncio
+async def test_crawl_pages_async_stops_batch_before_closing_shared_browser(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    events: list = []
+
+    class DummyCrawler:
+        def __init__(self, config=None):
+            events.append("init")
+
+        async def start(self):
+            events.append("start")
+            return self
+
+        async def close(self):
+            events.append("close")
+
+        async def arun(self, url, config):
+            events.append(("arun", url))
+            await asyncio.sleep(0)
+            return [SimpleNamespace(url=url)]
+
+    def fake_builder(result, *, dedup_mode="exact"):
+        return SimpleNamespace(status="success", request_url=result.url)
+
+    async def on_document(doc) -> None:
+        if doc.request_url == "https://a.example":
+            raise OSError("disk full")
+
+    monkeypatch.setattr(crawler, "AsyncWebCrawler", DummyCrawler)
+    monkeypatch.setattr(crawler, "build_document_from_result", fake_builder)
+
+    with pytest.raises(OSError, match="disk full"):
+        await crawler.crawl_pages_async(
+            ["https://a.example", "https://b.example", "https://c.example"],
+            config=object(),
+            concurrency=1,
+            on_document=on_document,
+        )
+    await asyncio.sleep(0.01)
+
+    assert events.count("start") == 1
+    assert events[-1] == "close"
+    assert events.count("close") == 1
+
+
+@pytest.mark.asyncio
+async def test_shared_crawler_refuses_to_restart_after_close() -> None:
+    shared = crawler._SharedCrawler(None)
+    await shared.close()
+
+    with pytest.raises(RuntimeError, match="already closed"):
+        await shared.get()
@@ -3,6 +3,9 @@ from __future__ import annotations
 from typing import Any
 from types import SimpleNamespace
 
+import pytest
+
+from crawler import markdown_dedup
 from crawler.builder import build_document_from_result
 from crawler.markdown_dedup import dedup_markdown, dedup_markdown_exact
 
@@ -251,3 +254,13 @@ Closing paragraph."""
     assert doc.metadata["dedup_mode"] == "off"
     assert doc.metadata["dedup_sections_removed"] == 0
     assert doc.metadata["dedup_applied"] is False
+
+
+def test_dedup_matches_without_xxhash(monkeypatch: pytest.MonkeyPatch) -> None:
+    markdown = "# A\n\nsame block\n\n# B\n\nsame block  \n\nother"
+    expected = dedup_markdown_exact(markdown)
+
+    monkeypatch.setattr(markdown_dedup, "xxhash", None)
+
+    assert dedup_markdown_exact(markdown) == expected
+    assert expected[1]["dedup_sections_removed"] == 1
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+import os
 from types import SimpleNamespace
 
 import pytest
@@ -9,6 +10,12 @@ import crawler
 from crawler import mcp_server
 
 
+@pytest.fixture(autouse=True)
+def _clear_caches() -> None:
+    mcp_server._CRAWL_CACHE.clear()
+    mcp_server._SEARCH_CACHE.clear()
+
+
 def _doc(metadata: dict | None = None) -> SimpleNamespace:
     return SimpleNamespace(
         request_url="https://example.com",
@@ -135,3 +142,322 @@ async def test_mcp_crawl_auth_error_propagates_from_resolver(
     assert (
         "Auth storage_state file not found" in payload["documents"][0]["error_message"]
     )
+
+
+@pytest.mark.asyncio
+async def test_mcp_server_is_built_lazily_with_all_tools() -> None:
+    server = mcp_server.mcp
+
+    assert server is mcp_server._get_mcp()
+    assert crawler.get_mcp_server() is server
+    tools = await server.list_tools()
+    assert sorted(tool.name for tool in tools) == ["crawl", "crawl_site", "search"]
+
+
+def test_markdown_output_computes_timestamp_once(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    calls = []
+
+    def fake_timestamp() -> str:
+        calls.append(1)
+        return "2024-01-01 00:00:00 UTC"
+
+    monkeypatch.setattr(mcp_server, "_format_timestamp", fake_timestamp)
+
+    output = mcp_server._format_output(
+        [_doc(), _doc(), _doc()], mcp_server.OutputFormat.markdown
+    )
+
+    assert len(calls) == 1
+    assert output.count("_Crawled: 2024-01-01 00:00:00 UTC_") == 3
+
+
+@pytest.mark.asyncio
+async def test_searxng_client_is_shared_until_closed() -> None:
+    client = mcp_server._get_searxng_client()
+    try:
+        assert mcp_server._get_searxng_client() is client
+    finally:
+        await mcp_server._close_searxng_client()
+
+    assert client.is_closed
+    replacement = mcp_server._get_searxng_client()
+    try:
+        assert replacement is not client
+    finally:
+        await mcp_server._close_searxng_client()
+
+
+@pytest.mark.asyncio
+async def test_lifespan_closes_searxng_client() -> None:
+    client = mcp_server._get_searxng_client()
+
+    async with mcp_server._lifespan(mcp_server._get_mcp()):
+        assert not client.is_closed
+
+    assert client.is_closed
+
+
+@pytest.mark.asyncio
+async def test_searxng_client_follows_configured_url(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    default = mcp_server._get_searxng_client()
+    monkeypatch.setattr(mcp_server, "SEARXNG_URL", "http://searx.example:8080")
+    try:
+        other = mcp_server._get_searxng_client()
+        assert other is not default
+        assert str(other.base_url) == "http://searx.example:8080"
+        assert mcp_server._get_searxng_client() is other
+    finally:
+        await mcp_server._close_searxng_client()
+
+    assert default.is_closed and other.is_closed
+
+
+@pytest.mark.asyncio
+async def test_mcp_search_parses_and_limits_results(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    import httpx
+
+    payload = {
+        "query": "python",
+        "results": [
+            {"title": f"r{i}", "url": f"https://r{i}.example"} for i in range(5)
+        ],
+        "number_of_results": 5,
+    }
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.params["q"] == "python"
+        return httpx.Response(200, json=payload)
+
+    client = httpx.AsyncClient(
+        base_url="http://searx.test", transport=httpx.MockTransport(handler)
+    )
+    monkeypatch.setattr(mcp_server, "_get_searxng_client", lambda: client)
+
+    try:
+        result = json.loads(await mcp_server.search("python", max_results=2))
+    finally:
+        await client.aclose()
+
+    assert [r["title"] for r in result["results"]] == ["r0", "r1"]
+    assert result["number_of_results"] == 2
+
+
+@pytest.mark.asyncio
+async def test_mcp_crawl_reuses_cached_successful_documents(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    crawled: list = []
+
+    async def fake_crawl_page_async(url: str, *, dedup_mode: str = "exact", auth=None):
+        crawled.append([url])
+        return _doc()
+
+    async def fake_crawl_pages_async(
+        urls, *, concurrency=3, dedup_mode="exact", auth=None
+    ):
+        crawled.append(list(urls))
+        docs = [_doc() for _ in urls]
+        docs[0].status = "failed"
+        return docs
+
+    monkeypatch.setattr(crawler, "crawl_page_async", fake_crawl_page_async)
+    monkeypatch.setattr(crawler, "crawl_pages_async", fake_crawl_pages_async)
+
+    await mcp_server.crawl(urls=["https://example.com"])
+    out = await mcp_server.crawl(
+        urls=["https://fail.example", "https://example.com", "https://b.example"],
+        output_format="json",
+    )
+    await mcp_server.crawl(urls=["https://example.com"], use_cache=False)
+    await mcp_server.crawl(urls=["https://example.com"], dedup_mode="off")
+
+    assert crawled == [
+        ["https://example.com"],
+        ["https://fail.example", "https://b.example"],
+        ["https://example.com"],
+        ["https://example.com"],
+    ]
+    statuses = [d["status"] for d in json.loads(out)["documents"]]
+    assert statuses == ["failed", "success", "success"]
+
+
+@pytest.mark.asyncio
+async def test_mcp_crawl_cache_tracks_storage_state_file_identity(
+    monkeypatch: pytest.MonkeyPatch, tmp_path
+) -> None:
+    crawled: list = []
+
+    async def fake_crawl_page_async(url: str, *, dedup_mode: str = "exact", auth=None):
+        crawled.append(auth["storage_state"])
+        return _doc()
+
+    monkeypatch.setattr(crawler, "crawl_page_async", fake_crawl_page_async)
+    monkeypatch.chdir(tmp_path)
+    state = tmp_path / "state.json"
+    state.write_text('{"cookies": []}', encoding="utf-8")
+
+    await mcp_server.crawl(urls=["https://example.com"], storage_state="state.json")
+    await mcp_server.crawl(urls=["https://example.com"], storage_state=str(state))
+
+    # Re-capturing into the same file must not serve the pre-login page.
+    state.write_text('{"cookies": [{"name": "sid"}]}', encoding="utf-8")
+    stat = state.stat()
+    os.utime(state, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    await mcp_server.crawl(urls=["https://example.com"], storage_state="state.json")
+
+    # Both spellings share one entry; the rewrite invalidates it.
+    assert crawled == ["state.json", "state.json"]
+
+
+@pytest.mark.asyncio
+async def test_mcp_search_reuses_cached_response(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    import httpx
+
+    requests: list = []
+    payload = {"results": [{"title": f"r{i}"} for i in range(5)]}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json=payload)
+
+    client = httpx.AsyncClient(
+        base_url="http://searx.test", transport=httpx.MockTransport(handler)
+    )
+    monkeypatch.setattr(mcp_server, "_get_searxng_client", lambda: client)
+
+    try:
+        first = json.loads(await mcp_server.search("python", max_results=2))
+        second = json.loads(await mcp_server.search("python", max_results=4))
+        await mcp_server.search("python", language="de")
+        await mcp_server.search("python", use_cache=False)
+        # Different credentials must not be served another identity's result.
+        monkeypatch.setattr(mcp_server, "SEARXNG_USERNAME", "alice")
+        monkeypatch.setattr(mcp_server, "SEARXNG_PASSWORD", "secret")
+        await mcp_server.search("python")
+    finally:
+        await client.aclose()
+
+    assert first["number_of_results"] == 2
+    assert second["number_of_results"] == 4
+    assert len(requests) == 4
+
+
+@pytest.mark.asyncio
+async def test_mcp_crawl_fetches_repeated_urls_once(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    crawled: list = []
+
+    async def fake_crawl_page_async(url: str, *, dedup_mode: str = "exact", auth=None):
+        crawled.append(url)
+        return _doc()
+
+    async def fake_crawl_pages_async(
+        urls, *, concurrency=3, dedup_mode="exact", auth=None
+    ):
+        crawled.extend(urls)
+        return [_doc() for _ in urls]
+
+    monkeypatch.setattr(crawler, "crawl_page_async", fake_crawl_page_async)
+    monkeypatch.setattr(crawler, "crawl_pages_async", fake_crawl_pages_async)
+
+    out = await mcp_server.crawl(
+        urls=["https://a.example", "https://a.example"],
+        output_format="json",
+        use_cache=False,
+    )
+
+    assert crawled == ["https://a.example"]
+    assert json.loads(out)["summary"]["total"] == 2
+
+
+@pytest.mark.asyncio
+async def test_mcp_search_coalesces_concurrent_identical_queries(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    import asyncio
+
+    import httpx
+
+    requests: list = []
+    release = asyncio.Event()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        await release.wait()
+        if request.url.params["q"] == "broken":
+            return httpx.Response(500, text="boom")
+        return httpx.Response(200, json={"results": [{"title": "r0"}]})
+
+    client = httpx.AsyncClient(
+        base_url="http://searx.test", transport=httpx.MockTransport(handler)
+    )
+    monkeypatch.setattr(mcp_server, "_get_searxng_client", lambda: client)
+
+    try:
+        calls = asyncio.gather(
+            mcp_server.search("python"),
+            mcp_server.search("python", use_cache=False),
+            mcp_server.search("broken"),
+            mcp_server.search("broken"),
+        )
+        await asyncio.sleep(0)
+        release.set()
+        results = [json.loads(out) for out in await calls]
+    finally:
+        await client.aclose()
+
+    assert len(requests) == 2
+    assert results[0] == results[1]
+    assert results[0]["number_of_results"] == 1
+    assert all("500" in r["error"] for r in results[2:])
+    assert mcp_server._SEARCH_INFLIGHT == {}
+
+
+@pytest.mark.parametrize(("value", "is_json"), [("JSON", True), ("xml", False)])
+@pytest.mark.asyncio
+async def test_mcp_crawl_output_format_lookup(
+    monkeypatch: pytest.MonkeyPatch, value: str, is_json: bool
+) -> None:
+    async def fake_crawl_page_async(url: str, *, dedup_mode: str = "exact", auth=None):
+        return _doc()
+
+    monkeypatch.setattr(crawler, "crawl_page_async", fake_crawl_page_async)
+
+    out = await mcp_server.crawl(urls=["https://example.com"], output_format=value)
+
+    assert out.startswith("{") is is_json
+
+
+@pytest.mark.parametrize(("count", "threaded"), [(20, False), (21, True)])
+@pytest.mark.asyncio
+async def test_mcp_search_serializes_large_responses_in_thread(
+    monkeypatch: pytest.MonkeyPatch, count: int, threaded: bool
+) -> None:
+    import asyncio
+
+    offloaded: list = []
+    real_to_thread = asyncio.to_thread
+
+    async def spy_to_thread(func, *args):
+        offloaded.append(func)
+        return await real_to_thread(func, *args)
+
+    async def fake_fetch(params):
+        return {"results": [{"title": f"r{i}"} for i in range(count)]}
+
+    monkeypatch.setattr(mcp_server, "_fetch_search", fake_fetch)
+    monkeypatch.setattr(mcp_server.asyncio, "to_thread", spy_to_thread)
+
+    result = json.loads(await mcp_server.search("python", max_results=50))
+
+    assert result["number_of_results"] == count
+    assert offloaded == ([mcp_server.dumps_json] if threaded else [])
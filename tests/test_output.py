@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from crawler import output
+from crawler.document import Reference
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("See [the docs](https://example.com/docs) now", "See the docs now"),
+        ("Visit https://example.com today", "Visit today"),
+        ("[https://example.com](https://example.com) rest", " rest"),
+        ("a  [b](c)   d", "a b d"),
+        ("no links here", "no links here"),
+    ],
+)
+def test_strip_markdown_links(text: str, expected: str) -> None:
+    assert output.strip_markdown_links(text) == expected
+
+
+def test_doc_to_dict_keeps_reference_objects() -> None:
+    ref = Reference(index=1, href="https://a.example", label="A")
+    doc = SimpleNamespace(
+        request_url="https://example.com",
+        final_url="https://example.com/",
+        status="success",
+        markdown="# ok",
+        error_message=None,
+        metadata={"title": "ok"},
+        references=[ref],
+    )
+
+    assert output.doc_to_dict(doc) == {
+        "request_url": "https://example.com",
+        "final_url": "https://example.com/",
+        "status": "success",
+        "markdown": "# ok",
+        "error_message": None,
+        "metadata": {"title": "ok"},
+        "references": [ref],
+    }
+
+
+def test_doc_to_dict_drops_duplicate_references() -> None:
+    first = Reference(index=1, href="https://a.example", label="A")
+    other_label = Reference(index=2, href="https://a.example", label="Home")
+    repeat = Reference(index=3, href="https://a.example", label="A")
+    doc = SimpleNamespace(
+        request_url="https://example.com",
+        final_url="https://example.com/",
+        status="success",
+        markdown="# ok",
+        error_message=None,
+        metadata={},
+        references=[first, other_label, repeat],
+    )
+
+    assert output.doc_to_dict(doc)["references"] == [first, other_label]
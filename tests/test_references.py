@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from crawler.document import Reference
+from crawler.references import parse_references
+
+
+def test_parse_references_reads_markdown_block() -> None:
+    block = (
+        "\n"
+        "## References\n"
+        "\n"
+        "  ⟨1⟩ https://a.example: First link  \r\n"
+        "⟨2⟩https://b.example\n"
+        "⟨3⟩   \n"
+        "not a reference ⟨4⟩ https://c.example\n"
+        "\t⟨5⟩ https://d.example:  \n"
+    )
+
+    assert parse_references(block, None) == [
+        Reference(index=1, href="https://a.example", label="First link"),
+        Reference(index=2, href="https://b.example", label=""),
+        Reference(index=5, href="https://d.example:", label=""),
+    ]
+
+
+def test_parse_references_falls_back_to_links() -> None:
+    links = {
+        "internal": [
+            {"href": "https://a.example", "text": " A "},
+            {"href": "https://a.example", "text": "A"},
+            {"href": ""},
+        ],
+        "external": [{"href": "https://b.example"}],
+    }
+
+    assert parse_references("", links) == [
+        Reference(index=1, href="https://a.example", label="A"),
+        Reference(index=2, href="https://b.example", label="https://b.example"),
+    ]
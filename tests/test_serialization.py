@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from crawler import serialization
+from crawler.document import Reference
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def backend(request, monkeypatch) -> str:
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(serialization, "orjson", None)
+    return request.param
+
+
+def test_dumps_json_matches_stdlib_indentation(backend: str) -> None:
+    payload = {"title": "Über", "items": [1, None, True], "empty": {}}
+
+    assert serialization.dumps_json(payload) == json.dumps(
+        payload, indent=2, ensure_ascii=False
+    )
+
+
+def test_write_json_writes_utf8(backend: str, tmp_path) -> None:
+    path = tmp_path / "out.json"
+
+    serialization.write_json(path, [{"markdown": "# Über"}])
+
+    assert json.loads(path.read_text(encoding="utf-8")) == [{"markdown": "# Über"}]
+
+
+def test_dumps_json_bytes_falls_back_for_big_ints(backend: str) -> None:
+    assert json.loads(serialization.dumps_json_bytes({"n": 2**70})) == {"n": 2**70}
+
+
+def test_dumps_json_encodes_reference_dataclasses(backend: str) -> None:
+    payload = {"references": [Reference(index=1, href="https://a.example", label="A")]}
+
+    assert json.loads(serialization.dumps_json(payload)) == {
+        "references": [{"index": 1, "href": "https://a.example", "label": "A"}]
+    }
+
+
+def test_loads_json_parses_bytes_and_rejects_invalid(backend: str) -> None:
+    assert serialization.loads_json(b'{"cookies": [], "origins": []}') == {
+        "cookies": [],
+        "origins": [],
+    }
+    with pytest.raises(json.JSONDecodeError):
+        serialization.loads_json(b"{not json")
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
 import json
+import re
 from pathlib import Path
+from types import SimpleNamespace
 
 import pytest
 
@@ -10,25 +13,36 @@ from crawler import cli
 from crawler.session_capture import (
     CdpSessionEntry,
     SessionCaptureConfigError,
+    _execute_capture_flow,
+    _validate_output_target,
+    _wait_for_completion,
     capture_session_async,
+    list_cdp_sessions_async,
 )
 
 
+_SUCCESS_FLOW = {
+    "status": "success",
+    "message": "ok",
+    "final_url": "https://example.com/dashboard",
+    "storage_state": {"cookies": [], "origins": []},
+}
+
+
+def _patch_capture_flow(monkeypatch: pytest.MonkeyPatch, flow: dict) -> None:
+    async def fake_flow(**kwargs):
+        return dict(flow)
+
+    monkeypatch.setattr("crawler.session_capture._execute_capture_flow", fake_flow)
+
+
 @pytest.mark.asyncio
 async def test_capture_session_success_writes_storage_state(
     monkeypatch: pytest.MonkeyPatch, tmp_path: Path
 ) -> None:
     output = tmp_path / "state.json"
 
-    async def fake_flow(**kwargs):
-        return {
-            "status": "success",
-            "message": "ok",
-            "final_url": "https://example.com/dashboard",
-            "storage_state": {"cookies": [], "origins": []},
-        }
-
-    monkeypatch.setattr("crawler.session_capture._execute_capture_flow", fake_flow)
+    _patch_capture_flow(monkeypatch, _SUCCESS_FLOW)
 
     result = await capture_session_async(
         str(output),
@@ -42,19 +56,30 @@ async def test_capture_session_success_writes_storage_state(
 
 
 @pytest.mark.asyncio
-async def test_capture_session_timeout_returns_explicit_status(
-    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+@pytest.mark.parametrize(
+    ("status", "message", "expected_fragment"),
+    [
+        ("timeout", "timed out", "timed out"),
+        ("abort", "user closed browser", "closed"),
+    ],
+)
+async def test_capture_session_non_success_returns_explicit_status(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+    status: str,
+    message: str,
+    expected_fragment: str,
 ) -> None:
     output = tmp_path / "state.json"
 
-    async def fake_flow(**kwargs):
-        return {
-            "status": "timeout",
-            "message": "timed out",
+    _patch_capture_flow(
+        monkeypatch,
+        {
+            "status": status,
+            "message": message,
             "final_url": "https://example.com/login",
-        }
-
-    monkeypatch.setattr("crawler.session_capture._execute_capture_flow", fake_flow)
+        },
+    )
 
     result = await capture_session_async(
         str(output),
@@ -62,60 +87,66 @@ async def test_capture_session_timeout_returns_explicit_status(
         timeout_seconds=1,
     )
 
-    assert result.status == "timeout"
-    assert "timed out" in result.message
+    assert result.status == status
+    assert expected_fragment in result.message
+    assert result.final_url == "https://example.com/login"
     assert result.storage_state_path is None
     assert not output.exists()
 
 
 @pytest.mark.asyncio
-async def test_capture_session_abort_returns_explicit_status(
+async def test_capture_session_requires_overwrite_for_existing_file(
     monkeypatch: pytest.MonkeyPatch, tmp_path: Path
 ) -> None:
     output = tmp_path / "state.json"
+    output.write_text("{}", encoding="utf-8")
 
-    async def fake_flow(**kwargs):
-        return {
-            "status": "abort",
-            "message": "user closed browser",
-            "final_url": "https://example.com/login",
-        }
+    _patch_capture_flow(monkeypatch, _SUCCESS_FLOW)
 
-    monkeypatch.setattr("crawler.session_capture._execute_capture_flow", fake_flow)
+    with pytest.raises(SessionCaptureConfigError, match="already exists"):
+        await capture_session_async(
+            str(output),
+            completion_url_pattern=r"https://example.com/dashboard.*",
+            overwrite=False,
+        )
 
-    result = await capture_session_async(
-        str(output),
-        completion_url_pattern=r"https://example.com/dashboard.*",
-    )
 
-    assert result.status == "abort"
-    assert "closed" in result.message
-    assert result.storage_state_path is None
-    assert not output.exists()
+@pytest.mark.asyncio
+async def test_capture_session_rejects_directory_output(tmp_path: Path) -> None:
+    with pytest.raises(SessionCaptureConfigError, match="is a directory"):
+        await capture_session_async(
+            str(tmp_path),
+            completion_url_pattern=r"https://example.com/dashboard.*",
+            overwrite=True,
+        )
+
+
+def test_validate_output_target_maps_unusual_stat_errors(tmp_path: Path) -> None:
+    parent_file = tmp_path / "not-a-dir"
+    parent_file.write_text("", encoding="utf-8")
+    # ENOTDIR: treated as a missing target, like Path.exists() did.
+    _validate_output_target(parent_file / "state.json", overwrite=False)
+
+    loop = tmp_path / "loop.json"
+    loop.symlink_to(loop)
+    # ELOOP: reported as a config error instead of a raw OSError.
+    with pytest.raises(SessionCaptureConfigError, match="not accessible"):
+        _validate_output_target(loop, overwrite=True)
 
 
 @pytest.mark.asyncio
-async def test_capture_session_requires_overwrite_for_existing_file(
+async def test_capture_session_rejects_invalid_pattern_before_launch(
     monkeypatch: pytest.MonkeyPatch, tmp_path: Path
 ) -> None:
-    output = tmp_path / "state.json"
-    output.write_text("{}", encoding="utf-8")
-
     async def fake_flow(**kwargs):
-        return {
-            "status": "success",
-            "message": "ok",
-            "final_url": "https://example.com/dashboard",
-            "storage_state": {"cookies": [], "origins": []},
-        }
+        raise AssertionError("capture flow must not start")
 
     monkeypatch.setattr("crawler.session_capture._execute_capture_flow", fake_flow)
 
-    with pytest.raises(SessionCaptureConfigError, match="already exists"):
+    with pytest.raises(SessionCaptureConfigError, match="not a valid regular"):
         await capture_session_async(
-            str(output),
-            completion_url_pattern=r"https://example.com/dashboard.*",
-            overwrite=False,
+            str(tmp_path / "state.json"),
+            completion_url_pattern=r"https://example.com/(dashboard",
         )
 
 
@@ -295,3 +326,251 @@ async def test_run_capture_async_rejects_cdp_flags_without_cdp_url() -> None:
 
     with pytest.raises(ValueError, match="require --cdp-url"):
         await cli._run_capture_async(args)
+
+
+class _FakePage:
+    def __init__(self, url: str) -> None:
+        self.url = url
+        self.closed = False
+        self.handlers: dict = {}
+        self.main_frame = SimpleNamespace(parent_frame=None)
+
+    def on(self, event: str, handler) -> None:
+        self.handlers[event] = handler
+
+    def remove_listener(self, event: str, handler) -> None:
+        if self.handlers.get(event) is handler:
+            del self.handlers[event]
+
+    def is_closed(self) -> bool:
+        return self.closed
+
+    def navigate(self, url: str) -> None:
+        self.url = url
+        handler = self.handlers.get("framenavigated")
+        if handler is not None:
+            handler(self.main_frame)
+
+    def close(self) -> None:
+        self.closed = True
+        self.handlers["close"](self)
+
+
+@pytest.mark.asyncio
+async def test_wait_for_completion_wakes_on_main_frame_navigation() -> None:
+    page = _FakePage("https://example.com/login")
+    prompts: list = []
+
+    def confirm(url: str) -> bool:
+        prompts.append(url)
+        return len(prompts) > 1
+
+    async def browse() -> None:
+        await asyncio.sleep(0)
+        page.handlers["framenavigated"](SimpleNamespace(parent_frame=object()))
+        page.navigate("https://example.com/dashboard")
+        while not prompts:
+            await asyncio.sleep(0)
+        page.navigate("https://example.com/dashboard/home")
+
+    browsing = asyncio.ensure_future(browse())
+    flow = await asyncio.wait_for(
+        _wait_for_completion(
+            page,
+            re.compile(r"/dashboard"),
+            timeout_seconds=30,
+            poll_interval=60,
+            confirm_callback=confirm,
+        ),
+        timeout=5,
+    )
+    await browsing
+
+    assert flow["status"] == "success"
+    assert flow["final_url"] == "https://example.com/dashboard/home"
+    assert page.handlers == {}
+    assert prompts == [
+        "https://example.com/dashboard",
+        "https://example.com/dashboard/home",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_wait_for_completion_reports_abort_and_timeout() -> None:
+    page = _FakePage("https://example.com/login")
+    asyncio.get_running_loop().call_soon(page.close)
+
+    aborted = await _wait_for_completion(
+        page,
+        re.compile(r"/dashboard"),
+        timeout_seconds=30,
+        poll_interval=60,
+        confirm_callback=None,
+    )
+    timed_out = await _wait_for_completion(
+        _FakePage("https://example.com/login"),
+        re.compile(r"/dashboard"),
+        timeout_seconds=0.01,
+        poll_interval=60,
+        confirm_callback=None,
+    )
+
+    assert aborted["status"] == "abort"
+    assert timed_out["status"] == "timeout"
+    assert timed_out["final_url"] == "https://example.com/login"
+
+
+@pytest.mark.asyncio
+async def test_list_cdp_sessions_fetches_titles_concurrently(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    in_flight = 0
+    peak = 0
+
+    class FakeCdpPage:
+        def __init__(self, url: str, title: str | None) -> None:
+            self.url = url
+            self._title = title
+
+        async def title(self) -> str:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            if self._title is None:
+                raise RuntimeError("page crashed")
+            return self._title
+
+    class FakeBrowser:
+        contexts = [
+            SimpleNamespace(
+                pages=[
+                    FakeCdpPage("https://example.com/a", "A"),
+                    FakeCdpPage("https://example.com/b", None),
+                ]
+            ),
+            SimpleNamespace(pages=[]),
+            SimpleNamespace(pages=[FakeCdpPage("https://example.com/c", "C")]),
+        ]
+
+        async def close(self) -> None:
+            return None
+
+    class FakePlaywright:
+        async def __aenter__(self):
+            async def connect_over_cdp(url: str) -> FakeBrowser:
+                return FakeBrowser()
+
+            return SimpleNamespace(
+                chromium=SimpleNamespace(connect_over_cdp=connect_over_cdp)
+            )
+
+        async def __aexit__(self, *exc_info) -> None:
+            return None
+
+    monkeypatch.setattr(
+        "crawler.session_capture._get_async_playwright",
+        lambda purpose: FakePlaywright,
+    )
+
+    sessions = await list_cdp_sessions_async("http://127.0.0.1:9222")
+
+    assert peak == 3
+    assert sessions == [
+        CdpSessionEntry(0, 0, "https://example.com/a", "A"),
+        CdpSessionEntry(0, 1, "https://example.com/b", None),
+        CdpSessionEntry(1, None, "", None),
+        CdpSessionEntry(2, 0, "https://example.com/c", "C"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_wait_for_completion_polls_url_changes_without_navigation() -> None:
+    page = _FakePage("https://example.com/login")
+    prompts: list = []
+
+    def confirm(url: str) -> bool:
+        prompts.append(url)
+        return len(prompts) > 1
+
+    async def script_driven_login() -> None:
+        await asyncio.sleep(0.01)
+        # e.g. history.pushState: the URL changes, no framenavigated fires
+        page.url = "https://example.com/dashboard"
+
+    login = asyncio.ensure_future(script_driven_login())
+    flow = await asyncio.wait_for(
+        _wait_for_completion(
+            page,
+            re.compile(r"/dashboard"),
+            timeout_seconds=30,
+            poll_interval=0.01,
+            confirm_callback=confirm,
+        ),
+        timeout=5,
+    )
+    await login
+
+    assert flow["status"] == "success"
+    # The declined prompt is asked again on the next poll, with no new event.
+    assert prompts == ["https://example.com/dashboard"] * 2
+
+
+@pytest.mark.asyncio
+async def test_capture_flow_timeout_includes_slow_navigation(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    page = _FakePage("about:blank")
+
+    async def finish_login() -> None:
+        await asyncio.sleep(0.1)
+        page.navigate("https://example.com/dashboard")
+
+    async def slow_goto(url: str) -> None:
+        await asyncio.sleep(0.3)
+        page.url = url
+        asyncio.ensure_future(finish_login())
+
+    page.goto = slow_goto
+
+    async def new_page():
+        return page
+
+    async def new_context():
+        return SimpleNamespace(new_page=new_page)
+
+    async def close() -> None:
+        return None
+
+    async def launch(headless: bool):
+        return SimpleNamespace(new_context=new_context, close=close)
+
+    class FakePlaywright:
+        async def __aenter__(self):
+            return SimpleNamespace(chromium=SimpleNamespace(launch=launch))
+
+        async def __aexit__(self, *exc_info) -> None:
+            return None
+
+    monkeypatch.setattr(
+        "crawler.session_capture._get_async_playwright",
+        lambda purpose: FakePlaywright,
+    )
+
+    flow = await asyncio.wait_for(
+        _execute_capture_flow(
+            start_url="https://example.com/login",
+            completion_pattern=re.compile(r"/dashboard"),
+            timeout_seconds=0.25,
+            poll_interval=60,
+            headless=True,
+            confirm_callback=None,
+        ),
+        timeout=5,
+    )
+
+    # The 0.3 s navigation alone exhausts the 0.25 s budget, so the login
+    # that completes 0.1 s later is too late.
+    assert flow["status"] == "timeout"
+    assert flow["final_url"] == "https://example.com/login"
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from crawler import site
+
+
+@pytest.mark.asyncio
+async def test_crawl_site_async_dedupes_urls_and_counts_statuses(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    results = [
+        SimpleNamespace(url="https://example.com/", status="success"),
+        SimpleNamespace(url="https://example.com/a", status="failed"),
+        SimpleNamespace(url="https://example.com/", status="success"),
+        SimpleNamespace(url="https://example.com/b", status="redirected"),
+        SimpleNamespace(url="https://example.com/c", status="success"),
+    ]
+
+    class DummyCrawler:
+        def __init__(self, config=None):
+            self.config = config
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, exc_type, exc, tb):
+            return False
+
+        async def arun(self, url, config):
+            return results
+
+    def fake_builder(result, *, dedup_mode="exact"):
+        return SimpleNamespace(
+            request_url=result.url,
+            status=result.status,
+            error_message="boom" if result.status == "failed" else None,
+        )
+
+    monkeypatch.setattr(site, "AsyncWebCrawler", DummyCrawler)
+    monkeypatch.setattr(site, "build_document_from_result", fake_builder)
+
+    result = await site.crawl_site_async("https://example.com/", max_pages=10)
+
+    assert [doc.request_url for doc in result.documents] == [
+        "https://example.com/",
+        "https://example.com/a",
+        "https://example.com/b",
+        "https://example.com/c",
+    ]
+    assert result.errors == [
+        {"url": "https://example.com/a", "error": "boom", "stage": "crawl"}
+    ]
+    assert result.stats == {
+        "total_pages": 4,
+        "successful_pages": 2,
+        "failed_pages": 1,
+        "error_count": 1,
+    }